@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+"""
+Benchmarks of the client against the in-process py:class:`fortifyapi.testing.FakeSSC`, so they need no SSC and
+are reproducible from run to run, e.g.
+
+    python benchmarks/bench.py --save benchmarks/results/before.json
+    # make a change
+    python benchmarks/bench.py --compare benchmarks/results/before.json
+
+Every benchmark runs `--repeat` times and the best run is kept. Use `--latency` to simulate a remote SSC.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from fortifyapi import FortifySSCClient, __version__  # noqa: E402
+from fortifyapi.client import Issue, Version  # noqa: E402
+from fortifyapi.testing import FakeSSC  # noqa: E402
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(f):
+        BENCHMARKS[name] = f
+        return f
+    return register
+
+
+def timed(f, *args, **kwargs):
+    start = time.perf_counter()
+    ret = f(*args, **kwargs)
+    return time.perf_counter() - start, ret
+
+
+class Context:
+
+    def __init__(self, args, ssc):
+        self.args = args
+        self.ssc = ssc
+        self.version = ssc.add_version('benchmark', 'issues', issues=args.issues)
+        self.client = FortifySSCClient(ssc.url, ssc.token, persistent=True)
+        self.endpoint = f"/api/v1/projectVersions/{self.version['id']}/issues"
+
+    def page(self, **kwargs):
+        with self.client.api as api:
+            return sum(1 for _ in api.page_data(self.endpoint, **kwargs))
+
+
+def _page_result(ctx, **kwargs):
+    seconds, count = timed(ctx.page, **kwargs)
+    assert count == ctx.args.issues, f"Expected {ctx.args.issues} issues, got {count}"
+    return dict(seconds=seconds, items_per_sec=count / seconds)
+
+
+@benchmark('page_data')
+def page_data(ctx):
+    return _page_result(ctx, limit=ctx.args.page_size)
+
+
+@benchmark('page_data_prefetch')
+def page_data_prefetch(ctx):
+    return _page_result(ctx, limit=ctx.args.page_size, prefetch=2)
+
+
+@benchmark('page_data_concurrent')
+def page_data_concurrent(ctx):
+    return _page_result(ctx, limit=ctx.args.page_size, concurrency=4)
+
+
+@benchmark('page_data_stream')
+def page_data_stream(ctx):
+    return _page_result(ctx, limit=-1)
+
+
+@benchmark('sscobject_construction')
+def sscobject_construction(ctx):
+    with ctx.client.api as api:
+        raw = list(api.page_data(ctx.endpoint, limit=ctx.args.page_size))
+    version = Version(ctx.client.api, dict(ctx.version), None)
+    issue_seconds, _ = timed(lambda: [Issue(ctx.client.api, e, version) for e in raw])
+    version_seconds, _ = timed(lambda: [Version(ctx.client.api, ctx.version, None) for _ in raw])
+    return dict(seconds=issue_seconds + version_seconds, usec_per_issue=issue_seconds / len(raw) * 1e6,
+                usec_per_version=version_seconds / len(raw) * 1e6)
+
+
+def _suppress(ctx, batch_size):
+    count = min(ctx.args.issues, ctx.args.bulk_issues)
+    version = Version(ctx.client.api, dict(ctx.version), None)
+    with ctx.client.api as api:
+        issues = [Issue(api, e, version) for e in api.page_data(ctx.endpoint, limit=count)][:count]
+        before = ctx.ssc.request_count()
+        if batch_size:
+            def run():
+                with api.batch(size=batch_size):
+                    futures = [issue.suppress() for issue in issues]
+                return [f.result() for f in futures]
+        else:
+            def run():
+                return [issue.suppress() for issue in issues]
+        seconds, _ = timed(run)
+    requests = ctx.ssc.request_count() - before
+    return dict(seconds=seconds, mutations_per_sec=count / seconds, requests=requests)
+
+
+@benchmark('mutations_unbatched')
+def mutations_unbatched(ctx):
+    return _suppress(ctx, None)
+
+
+@benchmark('mutations_bulk')
+def mutations_bulk(ctx):
+    return _suppress(ctx, ctx.args.bulk_size)
+
+
+@benchmark('upload')
+def upload(ctx):
+    size = ctx.args.transfer_mb * (1 << 20)
+    version = ctx.client.versions.get(ctx.version['id'])
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'benchmark.fpr')
+        with open(path, 'wb') as f:
+            f.write(os.urandom(size))
+        seconds, _ = timed(version.upload_artifact, path)
+    return dict(seconds=seconds, mb_per_sec=ctx.args.transfer_mb / seconds)
+
+
+@benchmark('download')
+def download(ctx):
+    ctx.ssc.files[('version', ctx.version['id'])] = os.urandom(ctx.args.transfer_mb * (1 << 20))
+    version = ctx.client.versions.get(ctx.version['id'])
+    result = version.download(dest=os.devnull, checksum=ctx.args.checksum)
+    seconds, size = result['seconds'], result['bytes']
+    return dict(seconds=seconds, mb_per_sec=size / (1 << 20) / seconds)
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    names = args.only or list(BENCHMARKS)
+    results = {}
+    with FakeSSC(latency=args.latency) as ssc:
+        ctx = Context(args, ssc)
+        for name in names:
+            runs = [BENCHMARKS[name](ctx) for _ in range(args.repeat)]
+            results[name] = min(runs, key=lambda r: r['seconds'])
+            print(f"{name:24} " + '  '.join(f"{k}={v:.4g}" for k, v in results[name].items()))
+        ctx.client.close()
+    return {
+        'meta': {
+            'date': datetime.now(timezone.utc).isoformat(),
+            'fortifyapi': __version__,
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'args': vars(args),
+        },
+        'results': results,
+    }
+
+
+def compare(previous, current):
+    print(f"\n{'benchmark':24} {'metric':18} {'before':>12} {'after':>12} {'change':>8}")
+    for name, metrics in current['results'].items():
+        for metric, value in metrics.items():
+            before = previous['results'].get(name, {}).get(metric)
+            if before is None:
+                continue
+            change = f"{(value - before) / before * 100:+.1f}%" if before else ''
+            print(f"{name:24} {metric:18} {before:12.4g} {value:12.4g} {change:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help="Benchmarks to run, default all")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds the fake SSC waits per request")
+    parser.add_argument('--issues', type=int, default=5000)
+    parser.add_argument('--page-size', type=int, default=200)
+    parser.add_argument('--bulk-issues', type=int, default=500)
+    parser.add_argument('--bulk-size', type=int, default=100)
+    parser.add_argument('--transfer-mb', type=int, default=16)
+    parser.add_argument('--checksum', help="hashlib algorithm the download benchmark computes, e.g. sha256")
+    parser.add_argument('--save', help="Write the results to this JSON file")
+    parser.add_argument('--compare', help="Compare with the results in this JSON file")
+    args = parser.parse_args()
+
+    current = run(args)
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w') as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), current)
+
+
+if __name__ == '__main__':
+    main()
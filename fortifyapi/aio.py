@@ -0,0 +1,370 @@
+import asyncio
+from typing import Union, Tuple, Any
+from .exceptions import *
+from . import __version__
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncFortifySSCAPI:
+    """
+    asyncio counterpart of py:class:`fortifyapi.api.FortifySSCAPI`, requires `aiohttp` (`pip install fortifyapi[async]`)
+    """
+    RETRY_STATUSES = (500, 502, 503, 504)
+
+    def __init__(self, url: str, auth: Union[str, Tuple[str, str]], proxies=None, verify=True, persistent=False,
+                 concurrency=20, retries=5, backoff_factor=0.1):
+        """
+        :param url: url to ssc, including the path. E.g. `https://fortifyssc/ssc`
+        :param auth: Authentication, either a token str or a (username, password) tuple
+        :param persistent: Keep the session (and token, if we created one) open after the outermost `async with`
+                           block exits. Call py:func:`close` when done.
+        :param concurrency: The most requests this api will have in flight at once, across all tasks
+        :param retries: How many times to retry a request that failed with a 5xx, like the sync api does
+        :param backoff_factor: Sleep `backoff_factor * 2 ** attempt` seconds between retries
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncFortifySSCAPI requires aiohttp, install it with `pip install fortifyapi[async]`")
+        self.url = url.rstrip('/')
+        self._token = None
+        self.__user = None
+        self.__pass = None
+        self.proxies = proxies
+        self.verify = verify
+        self.persistent = persistent
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self._session = None
+        self._semaphore = None
+        self._lock = None
+        self._depth = 0
+        self._closing = False
+
+        if isinstance(auth, str):
+            self._token = auth
+        elif len(auth) == 2:
+            # (user,pass)
+            self.__user = auth[0]
+            self.__pass = auth[1]
+        else:
+            raise AuthException("No valid authentication information")
+
+    async def __aenter__(self):
+        # asyncio primitives have to be created on the loop that uses them
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._session is None:
+                if self._token is None:
+                    self._token = await self.create_token()
+                self._semaphore = asyncio.Semaphore(self.concurrency)
+                self._session = aiohttp.ClientSession(
+                    headers={
+                        "Authorization": f"FortifyToken {self._token}",
+                        "Accept": 'application/json',
+                        "User-Agent": f"fortifyapi {__version__}"
+                    },
+                    connector=aiohttp.TCPConnector(limit=self.concurrency, ssl=None if self.verify else False)
+                )
+            self._depth += 1
+        return self
+
+    async def __aexit__(self, type, value, traceback):
+        async with self._lock:
+            self._depth -= 1
+            if self._depth == 0 and (self._closing or not self.persistent):
+                await self._release()
+
+    async def close(self):
+        """
+        Close the session and revoke the token we created, if any. Only needed for a `persistent` api.
+        """
+        if self._depth == 0:
+            await self._release()
+        else:
+            self._closing = True
+
+    async def _release(self):
+        self._closing = False
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        if self.__user and self.__pass and self._token is not None:
+            await self.revoke_token(self._token)
+            self._token = None
+
+    def _proxy(self):
+        if self.proxies:
+            return self.proxies.get(self.url.split(':', 1)[0])
+        return None
+
+    async def create_token(self, description: str = 'PySSC Python API', type: str = 'UnifiedLoginToken') -> str:
+        """
+        Create a token with given username and password. Does not need to be manually called for API to work.
+
+        :raises AuthException: If we are unable to create a token
+        :returns: The token itself
+        """
+        assert self.__user and self.__pass, "Cannot use token based authentication to create tokens."
+        async with aiohttp.ClientSession() as session:
+            async with session.post(f"{self.url}/api/v1/tokens", auth=aiohttp.BasicAuth(self.__user, self.__pass),
+                                    json=dict(type=type, description=description), proxy=self._proxy(),
+                                    ssl=None if self.verify else False) as r:
+                if r.status != 201:
+                    raise AuthException(f"Failed to authenticate - {r.status} - {await r.text()}")
+                return (await r.json(content_type=None))['data']['token']
+
+    async def revoke_token(self, token: str) -> None:
+        """
+        Revoke the given token
+
+        :raises AuthException: If we are unable to revoke the token
+        """
+        assert self.__user and self.__pass, "Cannot use token based authentication to create tokens."
+        async with aiohttp.ClientSession() as session:
+            async with session.post(f"{self.url}/api/v1/tokens/action/revoke",
+                                    auth=aiohttp.BasicAuth(self.__user, self.__pass), json=dict(tokens=[token]),
+                                    proxy=self._proxy(), ssl=None if self.verify else False) as r:
+                if r.status != 200:
+                    raise AuthException(f"Failed to revoke token - {r.status} - {await r.text()}")
+
+    def construct_request(self, method: str, path: str, data: Any) -> dict:
+        """
+        Construct a request for the bulk request API, see py:func:`fortifyapi.api.FortifySSCAPI.construct_request`
+        """
+        return {
+            'uri': f"{self.url}/{path.lstrip('/')}",
+            'httpVerb': method,
+            'postData': data
+        }
+
+    async def bulk_request(self, reqs):
+        """
+        :param reqs: The requests generated by py:func:`construct_request`
+        """
+        return await self.post('/api/v1/bulk', requests=reqs)
+
+    async def page_data(self, endpoint, concurrency=1, ordered=True, **kwargs):
+        """
+        Async generator over every item of a paged endpoint
+
+        :param concurrency: Once the first page tells us the `count`, fetch the remaining pages as this many tasks
+        :param ordered: Yield items in page order, otherwise as soon as their page arrives
+        :param kwargs: The query parameters, see py:func:`fortifyapi.api.FortifySSCAPI.get`
+        """
+        if 'start' not in kwargs:
+            kwargs['start'] = 0
+        if 'limit' not in kwargs:
+            kwargs['limit'] = 200  # default
+
+        r = await self.get(endpoint, **kwargs)
+        count = r['count'] if 'count' in r else 0
+
+        if concurrency > 1 and kwargs['limit'] > 0:
+            async def fetch(start):
+                return (await self.get(endpoint, **{**kwargs, 'start': start}))['data']
+
+            starts = iter(range(kwargs['start'] + kwargs['limit'], count, kwargs['limit']))
+            pending = [asyncio.ensure_future(fetch(s)) for _, s in zip(range(concurrency * 2), starts)]
+            try:
+                for e in r['data']:
+                    yield e
+                while pending:
+                    if ordered:
+                        done = [pending.pop(0)]
+                        await done[0]
+                    else:
+                        finished, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                        done = [f for f in pending if f in finished]
+                        pending = [f for f in pending if f not in finished]
+                    for f in done:
+                        start = next(starts, None)
+                        if start is not None:
+                            pending.append(asyncio.ensure_future(fetch(start)))
+                        for e in f.result():
+                            yield e
+            finally:
+                for f in pending:
+                    f.cancel()
+            return
+
+        while True:
+            for e in r['data']:
+                yield e
+            if (len(r['data']) + kwargs['start']) >= count:
+                break
+            kwargs['start'] = kwargs['start'] + kwargs['limit']
+            r = await self.get(endpoint, **kwargs)
+            count = r['count'] if 'count' in r else 0
+
+    async def get(self, endpoint, *args, **kwargs):
+        """
+        See py:func:`fortifyapi.api.FortifySSCAPI.get` for the available query parameters
+        """
+        data = args[0] if args else {}
+        data = {**data, **kwargs}
+        return await self._request('get', endpoint, params=data)
+
+    async def post(self, endpoint, *args, **kwargs):
+        data = args[0] if args else {}
+        data = {**data, **kwargs}
+        return await self._request('post', endpoint, json=data)
+
+    async def put(self, endpoint, *args, **kwargs):
+        data = args[0] if args else {}
+        data = {**data, **kwargs}
+        return await self._request('put', endpoint, json=data)
+
+    async def put_array(self, endpoint, array):
+        return await self._request('put', endpoint, json=array)
+
+    async def delete(self, endpoint, *args, **kwargs):
+        data = args[0] if args else {}
+        data = {**data, **kwargs}
+        return await self._request('delete', endpoint, params=data)
+
+    @staticmethod
+    def _params(params):
+        # aiohttp only takes str/int/float, encode the rest (e.g. Query, bool) the way requests does
+        ret = []
+        for k, v in (params or {}).items():
+            for e in (v if isinstance(v, (list, tuple)) else [v]):
+                if e is not None:
+                    ret.append((k, e if isinstance(e, (str, int, float)) and not isinstance(e, bool) else str(e)))
+        return ret
+
+    async def _request(self, method: str, endpoint: str, **kwargs):
+        if 'params' in kwargs:
+            kwargs['params'] = self._params(kwargs['params'])
+        if self.proxies:
+            kwargs['proxy'] = self._proxy()
+        url = f"{self.url}/{endpoint.lstrip('/')}"
+        async with self._semaphore:
+            for attempt in range(self.retries + 1):
+                async with self._session.request(method, url, **kwargs) as r:
+                    if r.status in self.RETRY_STATUSES and attempt < self.retries:
+                        await asyncio.sleep(self.backoff_factor * 2 ** attempt)
+                        continue
+                    if not 200 <= r.status <= 299:
+                        text = await r.text()
+                        if r.status == 409:
+                            raise ResourceNotFound(f"ResponseException - {r.status} - {text}", status=r.status)
+                        raise ResponseException(f"ResponseException - {r.status} - {text}", status=r.status)
+                    return await r.json(content_type=None)
+
+
+class AsyncFortifySSCClient:
+    """
+    asyncio counterpart of py:class:`fortifyapi.client.FortifySSCClient` covering the listing calls, e.g.
+
+        async with AsyncFortifySSCClient(url, token) as client:
+            async for version in client.versions.search(q=Query().query('project.name', 'foo')):
+                async for issue in version.issues.list():
+                    ...
+    """
+
+    def __init__(self, url: str, auth: Union[str, Tuple[str, str]], proxies=None, verify=True, persistent=False,
+                 concurrency=20):
+        """
+        :param url: url to ssc, including the path. E.g. `https://fortifyssc/ssc`
+        :param auth: Authentication, either a token str or a (username, password) tuple
+        :param concurrency: The most requests in flight at once, shared by every task using this client
+        """
+        self._api = AsyncFortifySSCAPI(url, auth, proxies, verify, persistent=persistent, concurrency=concurrency)
+
+        self.projects = AsyncProject(self._api, None, self)
+        self.versions = AsyncVersion(self._api, None, self)
+        self.cloudjobs = AsyncCloudJob(self._api, None, self)
+
+    async def __aenter__(self):
+        await self._api.__aenter__()
+        return self
+
+    async def __aexit__(self, type, value, traceback):
+        await self._api.__aexit__(type, value, traceback)
+
+    async def close(self):
+        await self._api.close()
+
+    @property
+    def api(self):
+        return self._api
+
+
+class AsyncSSCObject(dict):
+    def __init__(self, api, obj=None, parent=None):
+        super().__init__(obj if obj else {})
+        assert isinstance(api, AsyncFortifySSCAPI), 'Wrong parameter type, api should be AsyncFortifySSCAPI'
+        self._api = api
+        self.parent = parent
+
+    def __str__(self):
+        return f"{self.__class__}({super().__str__()})"
+
+    def is_instance(self):
+        return len(self) != 0
+
+    def assert_is_instance(self, msg=None):
+        if not self.is_instance():
+            raise NotAnInstanceException(msg)
+
+
+class AsyncProject(AsyncSSCObject):
+
+    def __init__(self, api, obj=None, parent=None):
+        super().__init__(api, obj, parent)
+        self.versions = AsyncVersion(api, None, self)
+
+    async def list(self, **kwargs):
+        """
+        :param kwargs: The request query parameters
+        :returns: Async generator of each fortifyapi.aio.AsyncProject
+        """
+        async with self._api as api:
+            async for e in api.page_data('/api/v1/projects', **kwargs):
+                yield AsyncProject(self._api, e, self.parent)
+
+
+class AsyncVersion(AsyncSSCObject):
+
+    def __init__(self, api, obj=None, parent=None):
+        super().__init__(api, obj, parent)
+        self.issues = AsyncIssue(api, None, self)
+
+    async def list(self, **kwargs):
+        if not isinstance(self.parent, AsyncProject) or not self.parent.is_instance():
+            raise ParentNotFoundException("No project parent found to query versions from")
+        async with self._api as api:
+            async for e in api.page_data(f"/api/v1/projects/{self.parent['id']}/versions", **kwargs):
+                p = AsyncProject(self._api, e['project'], None) if 'project' in e else self.parent
+                yield AsyncVersion(self._api, e, p)
+
+    async def search(self, **kwargs):
+        async with self._api as api:
+            async for e in api.page_data(f"/api/v1/projectVersions", **kwargs):
+                p = AsyncProject(self._api, e['project'], None) if 'project' in e else self.parent
+                yield AsyncVersion(self._api, e, p)
+
+    async def get(self, id):
+        async with self._api as api:
+            return AsyncVersion(self._api, (await api.get(f"/api/v1/projectVersions/{id}"))['data'], self.parent)
+
+
+class AsyncIssue(AsyncSSCObject):
+
+    async def list(self, **kwargs):
+        async with self._api as api:
+            async for e in api.page_data(f"/api/v1/projectVersions/{self.parent['id']}/issues", **kwargs):
+                yield AsyncIssue(self._api, e, self.parent)
+
+
+class AsyncCloudJob(AsyncSSCObject):
+
+    async def list(self, **kwargs):
+        async with self._api as api:
+            async for e in api.page_data(f"/api/v1/cloudjobs", **kwargs):
+                yield AsyncCloudJob(self._api, e, self.parent)
@@ -1,20 +1,142 @@
+import codecs
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, wait, FIRST_COMPLETED
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
 from typing import Union, Tuple, Any
 from .exceptions import *
+from .cache import ResponseCache
+from .limiter import AdaptiveLimiter
+from .names import NameIndex
+from .metrics import RequestMetrics
 from . import __version__
 
 
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_NUMBER_END = frozenset(',]} \t\n\r')
+
+
+def iter_json_items(response, key='data', chunk_size=65536):
+    """
+    Yield the items of the top level `key` array of a streamed (`stream=True`) JSON response one at a time, as they
+    download, so peak memory stays at about one item plus one chunk no matter how large the array is
+
+    :param response: A `requests.Response` opened with `stream=True`
+    :param key: The key of the array in the top level object
+    :param chunk_size: How many bytes to read from the socket at a time
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder(response.encoding or 'utf-8')()
+    chunks = response.iter_content(chunk_size)
+    buf, pos = '', 0
+
+    def fill():
+        nonlocal buf, pos
+        for chunk in chunks:
+            chunk = text.decode(chunk)
+            if chunk:
+                buf, pos = buf[pos:] + chunk, 0
+                return True
+        return False
+
+    def peek():
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                raise ValueError("Unexpected end of JSON response")
+
+    def value():
+        nonlocal pos
+        while True:
+            try:
+                v, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if not fill():
+                    raise
+                continue
+            # a number ends at a delimiter, until one is read it may continue in the next chunk, e.g. `1.` or `1e`
+            if isinstance(v, (int, float)) and not isinstance(v, bool) and \
+                    (end == len(buf) or buf[end] not in _NUMBER_END) and fill():
+                continue
+            pos = end
+            return v
+
+    if peek() != '{':
+        raise ValueError("Expected a JSON object")
+    pos += 1
+    while peek() != '}':
+        if buf[pos] == ',':
+            pos += 1
+            continue
+        name = value()
+        if peek() != ':':
+            raise ValueError("Expected ':' in JSON object")
+        pos += 1
+        if peek() != '[' or name != key:
+            value()
+            continue
+        pos += 1
+        while peek() != ']':
+            if buf[pos] == ',':
+                pos += 1
+                continue
+            yield value()
+        pos += 1
+
+
+def _option(value, factory):
+    """ True for `factory()`, None, False or another falsy scalar for None, otherwise the object given """
+    if value is True:
+        return factory()
+    if value is None or (isinstance(value, (bool, int, float, str)) and not value):
+        return None
+    return value
+
+
+class _ObservedRetry(Retry):
+    """ Retry that tells the api's limiter about every retried 5xx or connection error """
+    api = None
+
+    def new(self, **kw):
+        retry = super().new(**kw)
+        retry.api = self.api
+        return retry
+
+    def increment(self, *args, **kwargs):
+        if self.api is not None and self.api.limiter is not None:
+            # the start of the request being retried, so its later retries do not cut the cap again
+            self.api.limiter.backoff(getattr(self.api._sending, 'started', None))
+        return super().increment(*args, **kwargs)
+
+
 class FortifySSCAPI:
     """
     API object to talk to SSC via REST
     """
 
-    def __init__(self, url: str,  auth: Union[str, Tuple[str, str]], proxies=None, verify=True):
+    def __init__(self, url: str,  auth: Union[str, Tuple[str, str]], proxies=None, verify=True, persistent=False,
+                 pool_size=10, cache=None, limiter=None, names=None):
         """
         :param url: url to ssc, including the path. E.g. `https://fortifyssc/ssc`
         :param auth: Authentication, either a token str or a (username, password) tuple
+        :param persistent: Keep the session (and token, if we created one) open after the outermost `with` block
+                           exits, so keep-alive connections are reused across calls. Call py:func:`close` when done.
+        :param pool_size: How many connections to keep open, raise it when paging with a higher `concurrency`
+        :param cache: A py:class:`fortifyapi.cache.ResponseCache` for reference data GETs, or True for the defaults
+        :param limiter: A py:class:`fortifyapi.limiter.AdaptiveLimiter` capping the requests in flight, or True for
+                        the defaults. Share one between apis talking to the same SSC.
+        :param names: A py:class:`fortifyapi.names.NameIndex` resolving project and version names without a
+                      request, or True for the defaults
         """
         self.url = url.rstrip('/')
         self._token = None
@@ -22,6 +144,20 @@ class FortifySSCAPI:
         self.__pass = None
         self.proxies = proxies
         self.verify = verify
+        self.persistent = persistent
+        self.pool_size = pool_size
+        self.cache = _option(cache, ResponseCache)
+        self.limiter = _option(limiter, AdaptiveLimiter)
+        self.names = _option(names, NameIndex)
+        # set to None to turn the instrumentation off
+        self.metrics = RequestMetrics()
+        self._session = None
+        self._depth = 0
+        self._closing = False
+        self._lock = threading.RLock()
+        self._batchers = threading.local()
+        # the start of the request this thread is sending, for _ObservedRetry
+        self._sending = threading.local()
 
         if isinstance(auth, str):
             self._token = auth
@@ -33,28 +169,61 @@ class FortifySSCAPI:
             raise AuthException("No valid authentication information")
 
     def __enter__(self):
-        if self._token is None:
-            self._authorize()
-        self._session = requests.Session()
-        self._session.headers.update({
+        # `with` blocks nest (generators call other generators), only the outermost one sets up and tears down
+        with self._lock:
+            if self._session is None:
+                if self._token is None:
+                    self._authorize()
+                self._session = self._new_session()
+            self._depth += 1
+        return self
+
+    def _new_session(self):
+        session = requests.Session()
+        session.headers.update({
             "Authorization": f"FortifyToken {self._token}",
             "Accept": 'application/json',
             "User-Agent": f"fortifyapi {__version__}"
         })
         # ssc is not reliable
-        retries = Retry(
+        retries = _ObservedRetry(
             total=5,
             backoff_factor=0.1,
             status_forcelist=[500, 502, 503, 504]
         )
-        self._session.mount('https://', HTTPAdapter(max_retries=retries))
-        return self
+        retries.api = self
+        adapter = HTTPAdapter(max_retries=retries, pool_maxsize=self.pool_size)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
 
     def _authorize(self):
         self._token = self.create_token()
 
     def __exit__(self, type, value, traceback):
-        if self.__user and self.__pass:
+        with self._lock:
+            self._depth -= 1
+            if self._depth == 0 and (self._closing or not self.persistent):
+                self._release()
+
+    def close(self):
+        """
+        Close the session and revoke the token we created, if any. Only needed for a `persistent` api, the session
+        is released at the end of the outermost `with` block otherwise. If called inside a `with` block, the release
+        happens when that block exits.
+        """
+        with self._lock:
+            if self._depth == 0:
+                self._release()
+            else:
+                self._closing = True
+
+    def _release(self):
+        self._closing = False
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+        if self.__user and self.__pass and self._token is not None:
             self._unauthorize()
 
     def _unauthorize(self):
@@ -123,24 +292,207 @@ class FortifySSCAPI:
         """
         return self.post('/api/v1/bulk', requests=reqs)
 
-    def page_data(self, endpoint, **kwargs):
+    def batch(self, size=100, interval=None):
+        """
+        Queue the mutations made inside the returned context in `/api/v1/bulk` requests instead of sending each one
+        on its own, e.g.
+
+            with client.api.batch(size=200) as batch:
+                futures = [issue.suppress() for issue in version.issues.list()]
+            results = [f.result() for f in futures]
+
+        While a batch is active in this thread, the methods that go through py:func:`submit` return a
+        `concurrent.futures.Future` of their result instead of the result itself.
+
+        :param size: Send the queued requests once this many are waiting
+        :param interval: Also send them once the oldest has waited this many seconds
+        """
+        return BulkBatcher(self, size, interval)
+
+    @property
+    def batcher(self):
+        """ The innermost active py:class:`BulkBatcher` of the calling thread, if any """
+        stack = getattr(self._batchers, 'stack', None)
+        return stack[-1] if stack else None
+
+    def submit(self, method: str, endpoint: str, data: Any = None, transform=None):
+        """
+        Send a mutation, or queue it on the active py:class:`BulkBatcher` of this thread.
+
+        :param method: The HTTP method
+        :param endpoint: The endpoint
+        :param data: The json body, unused for DELETE
+        :param transform: Called with the response to produce the return value
+        :returns: The (transformed) response, or a Future of it while batching
+        """
+        batcher = self.batcher
+        if batcher is not None:
+            return batcher.add(method, endpoint, data, transform)
+        if method.lower() == 'delete':
+            r = self._request('delete', endpoint)
+        else:
+            r = self._request(method.lower(), endpoint, json=data)
+        return transform(r) if transform else r
+
+    def page_data(self, endpoint, concurrency=1, ordered=True, prefetch=0, stream=None, **kwargs):
+        """
+        Generator over every item of a paged endpoint
+
+        :param endpoint: The endpoint to page through
+        :param concurrency: Once the first page tells us the `count`, fetch the remaining pages with this many threads
+        :param ordered: Yield items in page order, otherwise as soon as their page arrives. Only used when
+                        `concurrency` is above 1
+        :param prefetch: How many pages to fetch in the background ahead of the page being consumed, so the network
+                         latency overlaps with whatever the caller does with each item
+        :param stream: Decode the response item by item as it downloads, see py:func:`stream_data`. Defaults to on
+                       when paging is disabled with `limit=-1`
+        :param kwargs: The query parameters, see py:func:`get`
+        """
         if 'start' not in kwargs:
             kwargs['start'] = 0
         if 'limit' not in kwargs:
             kwargs['limit'] = 200  # default
+        if stream or (stream is None and kwargs['limit'] == -1):
+            for e in self.stream_data(endpoint, **kwargs):
+                yield e
+            return
 
         r = self.get(endpoint, **kwargs)
-
-        for e in r['data']:
-            yield e
-
-        data_len = len(r['data'])
         count = r['count'] if 'count' in r else 0
 
-        if (data_len + kwargs['start']) < count:
+        if (concurrency > 1 or prefetch > 0) and kwargs['limit'] > 0:
+            starts = range(kwargs['start'] + kwargs['limit'], count, kwargs['limit'])
+            window = max(prefetch, concurrency * 2 if concurrency > 1 else 1)
+            for e in self._fetch_pages(endpoint, r['data'], starts, concurrency, window, ordered, kwargs):
+                yield e
+            return
+
+        while True:
+            for e in r['data']:
+                yield e
+            if (len(r['data']) + kwargs['start']) >= count:
+                break
             kwargs['start'] = kwargs['start'] + kwargs['limit']
-            for e in self.page_data(endpoint, **kwargs):
+            r = self.get(endpoint, **kwargs)
+            count = r['count'] if 'count' in r else 0
+
+    def _fetch_pages(self, endpoint, first, starts, workers, window, ordered, kwargs):
+        """
+        Yield the already fetched `first` page while the pages at the given `start` offsets are fetched in the
+        background, keeping at most `window` pages in flight so an abandoned generator does not keep downloading
+        """
+        def fetch(start):
+            return self.get(endpoint, **{**kwargs, 'start': start})['data']
+
+        starts = iter(starts)
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            try:
+                for start in starts:
+                    pending.append(pool.submit(fetch, start))
+                    if len(pending) >= window:
+                        break
+                for e in first:
+                    yield e
+                while pending:
+                    if ordered:
+                        done = [pending.popleft()]
+                    else:
+                        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        done = [f for f in pending if f in finished]
+                        for f in done:
+                            pending.remove(f)
+                    for f in done:
+                        start = next(starts, None)
+                        if start is not None:
+                            pending.append(pool.submit(fetch, start))
+                        for e in f.result():
+                            yield e
+            finally:
+                for f in pending:
+                    f.cancel()
+
+    def stream_data(self, endpoint, chunk_size=65536, **kwargs):
+        """
+        Generator over the `data` of a GET that is decoded item by item while it downloads, rather than loading the
+        whole document first. Meant for unpaged (`limit=-1`) requests that can return hundreds of MB.
+
+        :param endpoint: The endpoint
+        :param chunk_size: How many bytes to read at a time
+        :param kwargs: The query parameters, see py:func:`get`
+        """
+        r = self._send('get', endpoint, params=kwargs, stream=True)
+        try:
+            for e in iter_json_items(r, 'data', chunk_size):
                 yield e
+        finally:
+            r.close()
+
+    def download(self, url, dest, chunk_size=1 << 20, retries=3, checksum=None, progress=None) -> dict:
+        """
+        Stream a file, e.g. an FPR, to disk without holding it in memory. A transfer that breaks off is resumed
+        where it stopped with an HTTP Range request.
+
+        :param url: The url, absolute or relative to the api url, or a callable returning one. Use a callable when
+                    the url embeds a single use token, it is called again for every resume.
+        :param dest: A file path or a writable binary file object. Should the server not support resuming, a
+                     seekable file object is rewound to where it was and written again, others fail.
+        :param chunk_size: How many bytes to read at a time
+        :param retries: How many times to resume a broken transfer
+        :param checksum: A hashlib algorithm name, e.g. `sha256`, to compute while streaming
+        :param progress: Called with (bytes so far, total bytes or None, bytes per second) after every chunk
+        :returns: `{'bytes', 'seconds', 'bytes_per_sec', 'checksum', 'resumes'}`
+        """
+        digest = hashlib.new(checksum) if checksum else None
+        f = open(dest, 'wb') if isinstance(dest, (str, bytes, os.PathLike)) else dest
+        origin = f.tell() if f.seekable() else None
+        written, total, resumes = 0, None, 0
+        started = time.monotonic()
+        try:
+            while True:
+                endpoint = url() if callable(url) else url
+                if endpoint.startswith(self.url):
+                    endpoint = endpoint[len(self.url):]
+                headers = {'Range': f"bytes={written}-"} if written else {}
+                r = None
+                try:
+                    r = self._send('get', endpoint, headers=headers, stream=True)
+                    if written and r.status_code != 206:
+                        # the server ignored the range, start over
+                        if origin is None:
+                            raise ResponseException(f"Download stopped at {written} bytes, the server does not "
+                                                    f"support resuming it and the destination cannot be rewound")
+                        f.seek(origin)
+                        f.truncate()
+                        written, digest = 0, hashlib.new(checksum) if checksum else None
+                    if r.status_code == 206:
+                        total = int(r.headers['Content-Range'].rpartition('/')[2])
+                    elif 'Content-Length' in r.headers:
+                        total = int(r.headers['Content-Length'])
+                    for chunk in r.iter_content(chunk_size):
+                        f.write(chunk)
+                        if digest:
+                            digest.update(chunk)
+                        written += len(chunk)
+                        if progress:
+                            progress(written, total, written / max(time.monotonic() - started, 1e-9))
+                    if total is None or written >= total:
+                        break
+                except requests.exceptions.RequestException:
+                    if resumes >= retries:
+                        raise
+                finally:
+                    if r is not None:
+                        r.close()
+                if resumes >= retries:
+                    raise ResponseException(f"Download stopped at {written} of {total} bytes")
+                resumes += 1
+        finally:
+            if f is not dest:
+                f.close()
+        seconds = time.monotonic() - started
+        return dict(bytes=written, seconds=seconds, bytes_per_sec=written / max(seconds, 1e-9),
+                    checksum=digest.hexdigest() if digest else None, resumes=resumes)
 
     def get(self, endpoint, *args, **kwargs):
         """
@@ -182,15 +534,171 @@ class FortifySSCAPI:
         return self._request('delete', endpoint, params=data)
 
     def _request(self, method: str, endpoint: str, **kwargs):
+        cache = self.cache
+        if cache is not None:
+            if method.lower() == 'get':
+                hit, data = cache.get(endpoint, kwargs.get('params'))
+                if hit:
+                    return data
+            else:
+                self._invalidate(cache, endpoint, kwargs.get('json'))
+        r = self._send(method, endpoint, **kwargs)
+        data = r.json()
+        #print(f"{method} {endpoint}\n\t{r.text}")
+        if cache is not None:
+            if method.lower() == 'get':
+                cache.put(endpoint, kwargs.get('params'), data)
+            else:
+                # a GET racing with the change may have cached the old state again
+                self._invalidate(cache, endpoint, kwargs.get('json'))
+        return data
+
+    def _invalidate(self, cache, endpoint, body):
+        cache.invalidate(endpoint)
+        if endpoint.strip('/') == 'api/v1/bulk' and isinstance(body, dict):
+            for req in body.get('requests', []):
+                if req.get('httpVerb', 'GET').upper() != 'GET':
+                    cache.invalidate(req['uri'][len(self.url):] if req['uri'].startswith(self.url) else req['uri'])
+
+    def _send(self, method: str, endpoint: str, **kwargs):
         if self.proxies:
             kwargs['proxies'] = self.proxies
         if not self.verify:
             kwargs['verify'] = self.verify
-        r = self._session.request(method, f"{self.url}/{endpoint.lstrip('/')}", **kwargs)
+        limiter, metrics = self.limiter, self.metrics
+        started = limiter.acquire() if limiter is not None else time.monotonic()
+        self._sending.started = started
+        r = None
+        try:
+            url = endpoint if '://' in endpoint else f"{self.url}/{endpoint.lstrip('/')}"
+            r = self._session.request(method, url, **kwargs)
+        finally:
+            status = r.status_code if r is not None else None
+            if limiter is not None:
+                limiter.release(started, status)
+            if metrics is not None:
+                metrics.record(method, endpoint, time.monotonic() - started, status,
+                               self._bytes_in(r, kwargs.get('stream')), self._bytes_out(r))
         if 200 <= r.status_code >= 299:
             if r.status_code == 409:
-                raise ResourceNotFound(f"ResponseException - {r.status_code} - {r.text}")
-            raise ResponseException(f"ResponseException - {r.status_code} - {r.text}")
-        data = r.json()
-        #print(f"{method} {endpoint}\n\t{r.text}")
-        return data
\ No newline at end of file
+                raise ResourceNotFound(f"ResponseException - {r.status_code} - {r.text}", status=r.status_code)
+            raise ResponseException(f"ResponseException - {r.status_code} - {r.text}", status=r.status_code)
+        return r
+
+    @staticmethod
+    def _bytes_in(r, stream):
+        if r is None:
+            return 0
+        if stream:
+            # reading it here would defeat the streaming
+            return int(r.headers.get('Content-Length') or 0)
+        return len(r.content)
+
+    @staticmethod
+    def _bytes_out(r):
+        body = r.request.body if r is not None else None
+        if body is None:
+            return 0
+        if isinstance(body, (bytes, str)):
+            return len(body)
+        # MultipartEncoder and friends
+        return getattr(body, 'len', 0)
+
+class BulkBatcher:
+    """
+    Collects requests as sub-requests of `/api/v1/bulk`, sending them once `size` are queued, once the oldest has
+    waited `interval` seconds, or when the context exits. Every sub-request gets a `concurrent.futures.Future` that
+    is completed with its own response (or a ResponseException) once its bulk request returns. Create one with
+    py:func:`FortifySSCAPI.batch`.
+    """
+
+    def __init__(self, api: FortifySSCAPI, size=100, interval=None):
+        self.api = api
+        self.size = size
+        self.interval = interval
+        self._queue = []
+        self._lock = threading.RLock()
+        # held while a bulk request is on the wire, so they go out in order without blocking `add`
+        self._sending = threading.Lock()
+        self._timer = None
+
+    def __enter__(self):
+        self.api.__enter__()
+        if not hasattr(self.api._batchers, 'stack'):
+            self.api._batchers.stack = []
+        self.api._batchers.stack.append(self)
+        return self
+
+    def __exit__(self, type, value, traceback):
+        try:
+            self.flush()
+        finally:
+            self.api._batchers.stack.remove(self)
+            self.api.__exit__(type, value, traceback)
+
+    def __len__(self):
+        return len(self._queue)
+
+    def add(self, method: str, endpoint: str, data: Any = None, transform=None) -> Future:
+        """
+        Queue a request
+
+        :param method: The HTTP method
+        :param endpoint: The relative endpoint, as given to py:func:`FortifySSCAPI.construct_request`
+        :param data: The postData
+        :param transform: Called with the sub-response to produce the result of the future
+        """
+        return self.add_request(self.api.construct_request(method.upper(), endpoint, data), transform)
+
+    def add_request(self, request: dict, transform=None) -> Future:
+        """
+        Queue a request made by py:func:`FortifySSCAPI.construct_request`, e.g. from a version template
+        """
+        future = Future()
+        with self._lock:
+            self._queue.append((request, future, transform))
+            full = len(self._queue) >= self.size
+            if not full and self.interval and self._timer is None:
+                self._timer = threading.Timer(self.interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if full:
+            self.flush()
+        return future
+
+    def flush(self):
+        """
+        Send everything queued so far. Failures are set on the futures rather than raised here.
+
+        :returns: The futures that were sent
+        """
+        with self._sending:
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                queue, self._queue = self._queue, []
+            if not queue:
+                return []
+            try:
+                with self.api as api:
+                    responses = api.bulk_request([request for request, _, _ in queue])['data']
+            except Exception as e:
+                for _, future, _ in queue:
+                    future.set_exception(e)
+                return [future for _, future, _ in queue]
+            for (_, future, transform), response in zip(queue, responses):
+                body = response['responses'][0]['body'] if response.get('responses') else {}
+                code = body.get('responseCode', 200) if isinstance(body, dict) else 200
+                if not 200 <= code <= 299:
+                    future.set_exception(ResponseException(f"ResponseException - {code} - {body}", status=code))
+                    continue
+                try:
+                    future.set_result(transform(body) if transform else body)
+                except Exception as e:
+                    future.set_exception(e)
+            for _, future, _ in queue[len(responses):]:
+                future.set_exception(ResponseException(
+                    f"ResponseException - the bulk request returned {len(responses)} responses for {len(queue)}"
+                    f" requests"))
+            return [future for _, future, _ in queue]
@@ -0,0 +1,121 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from fnmatch import fnmatchcase
+
+# reference data that rarely changes, in seconds
+DEFAULT_TTLS = {
+    '/api/v1/engineTypes*': 3600,
+    '/api/v1/coreRulepacks*': 600,
+    '/api/v1/bugtrackers*': 600,
+    # the pools themselves, not their jobs or the disabled workers, which change all the time
+    '/api/v1/cloudpools/disabledWorkers*': None,
+    '/api/v1/cloudpools/*/*': None,
+    '/api/v1/cloudpools*': 300,
+    '/api/v1/attributeDefinitions*': 600,
+    '/api/v1/issueTemplates*': 600,
+}
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache for GET responses, used by py:class:`fortifyapi.api.FortifySSCAPI` when given as its `cache`.
+
+    Only endpoints matching one of the `ttls` patterns are cached. Any POST, PUT or DELETE the api sends drops
+    the cached responses of the same resource, e.g. a POST to `/api/v1/cloudpools` or a DELETE of
+    `/api/v1/cloudpools/{uuid}` invalidates everything cached under `/api/v1/cloudpools`.
+    """
+
+    def __init__(self, ttls=None, maxsize=256):
+        """
+        :param ttls: dict of endpoint glob pattern to seconds, or None to not cache, first match wins. Defaults to
+                     `DEFAULT_TTLS`. Note `*` also matches `/`.
+        :param maxsize: The most responses to keep, the least recently used is evicted first
+        """
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _path(endpoint):
+        return '/' + endpoint.split('?', 1)[0].strip('/')
+
+    @staticmethod
+    def _resource(path):
+        # /api/v1/<resource>/...
+        return '/'.join(path.split('/')[:4])
+
+    def ttl(self, endpoint):
+        """
+        :returns: The seconds `endpoint` is cached for, or None if it is not cached
+        """
+        path = self._path(endpoint)
+        for pattern, ttl in self.ttls.items():
+            if fnmatchcase(path, pattern):
+                return ttl
+        return None
+
+    def _key(self, endpoint, params):
+        return self._path(endpoint), endpoint.partition('?')[2], \
+            tuple(sorted((k, str(v)) for k, v in (params or {}).items()))
+
+    def get(self, endpoint, params=None):
+        """
+        :returns: A (hit, response) tuple
+        """
+        if self.ttl(endpoint) is None:
+            return False, None
+        key = self._key(endpoint, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            data = entry[1]
+        # callers are free to modify what they get back
+        return True, copy.deepcopy(data)
+
+    def put(self, endpoint, params, data):
+        ttl = self.ttl(endpoint)
+        if ttl is None:
+            return
+        key = self._key(endpoint, params)
+        data = copy.deepcopy(data)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, endpoint):
+        """
+        Drop every cached response of the resource `endpoint` belongs to
+        """
+        resource = self._resource(self._path(endpoint))
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == resource or k[0].startswith(resource + '/')]:
+                del self._entries[key]
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        :returns: The hit, miss, eviction and invalidation counters and the current size
+        """
+        with self._lock:
+            return dict(hits=self.hits, misses=self.misses, evictions=self.evictions,
+                        invalidations=self.invalidations, size=len(self._entries))
@@ -1,25 +1,37 @@
 from typing import Union, Tuple
-from datetime import date
+from datetime import date, datetime, timedelta, timezone
+from fnmatch import fnmatchcase
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 import time
 from socket import gethostname
 from .exceptions import *
 from .template import *
-from .query import Query
+from .query import Query, SHOW_ALL
 from .api import FortifySSCAPI
+from .records import to_records, to_columns
+from . import summary
 from requests_toolbelt import MultipartEncoder
 from os.path import basename, exists
 
 
 class FortifySSCClient:
 
-    def __init__(self, url: str, auth: Union[str, Tuple[str, str]], proxies=None, verify=True):
+    def __init__(self, url: str, auth: Union[str, Tuple[str, str]], proxies=None, verify=True, persistent=False,
+                 cache=None, limiter=None, names=None):
         """
         :param url: url to ssc, including the path. E.g. `https://fortifyssc/ssc`
         :param auth: Authentication, either a token str or a (username, password) tuple
+        :param persistent: Reuse one session and token for the lifetime of the client, see py:func:`close`
+        :param cache: Cache reference data GETs, see py:class:`fortifyapi.cache.ResponseCache`. True for the defaults
+        :param limiter: Adaptively cap the requests in flight, see py:class:`fortifyapi.limiter.AdaptiveLimiter`
+        :param names: Resolve project and version names locally, see py:class:`fortifyapi.names.NameIndex`.
+                      True for the defaults
         """
         self._url = url
         self._auth = auth
-        self._api = FortifySSCAPI(url, auth, proxies, verify)
+        self._api = FortifySSCAPI(url, auth, proxies, verify, persistent=persistent, cache=cache,
+                                  limiter=limiter, names=names)
 
         self.versions = Version(self._api, None, self)
         self.projects = Project(self._api, None, self)
@@ -32,6 +44,19 @@ class FortifySSCClient:
         self.ldap_user = LdapUser(self._api, None, self)
         self.rulepacks = Rulepack(self._api, None, self)
         self.filetoken = FileToken(self._api, None, self)
+        self._summaries = {}
+
+    def __enter__(self):
+        # every call made inside this block shares one session and token
+        self._api.__enter__()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self._api.__exit__(type, value, traceback)
+
+    def close(self):
+        """ Release the session and token held by a `persistent` client """
+        self._api.close()
 
     def _list(self, endpoint, **kwargs):
         with self._api as api:
@@ -48,6 +73,32 @@ class FortifySSCClient:
         for e in self._list('/api/v1/projectVersions', **kwargs):
             yield Version(self._api, e, None)
             
+    def issue_summaries(self, series_type='DEFAULT', group_axis_type='ISSUE_FOLDER', workers=8, previous=None,
+                        refresh=False, progress=None) -> summary.SummaryTable:
+        """
+        py:func:`Version.issue_summary` of every version, fetched `workers` at a time, e.g.
+
+            table = client.issue_summaries(progress=lambda done, total: print(f"{done}/{total}"))
+            table.totals()
+
+        The versions come from one py:func:`list_all_project_versions` pass. A version whose `currentState` did
+        not change since the last call keeps its summary from then, so calling this again only fetches what changed.
+
+        :param previous: A py:class:`fortifyapi.summary.SummaryTable` to refresh, e.g. one saved by an earlier run.
+                         Defaults to the last table this client built for the same series and axis.
+        :param refresh: Fetch every summary again
+        :param progress: Called with (done, total) versions as the summaries come in
+        """
+        key = (series_type, group_axis_type)
+        if refresh:
+            previous = None
+        elif previous is None:
+            previous = self._summaries.get(key)
+        table = summary.collect(self, previous, workers, progress, seriestype=series_type,
+                                groupaxistype=group_axis_type)
+        self._summaries[key] = table
+        return table
+
     def list_all_bugtrackers(self, **kwargs):
         with self._api as api:
             for e in api.page_data(f"/api/v1/bugtrackers", **kwargs):
@@ -62,7 +113,30 @@ class FortifySSCClient:
         return self._api
 
 
+class _Child:
+    """
+    A child collection such as `version.issues`, only built when first accessed and then kept on the instance.
+    It holds no copy of the parent's data, the collection reads what it needs from its `parent`.
+    """
+
+    def __init__(self, cls_name):
+        # by name, most classes are defined after their parents
+        self.cls_name = cls_name
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        child = instance.__dict__[self.name] = globals()[self.cls_name](instance._api, None, instance)
+        return child
+
+
 class SSCObject(dict):
+    # named `fields` projections, e.g. `Issue.list(fields='lite')`
+    FIELDS = {}
+
     def __init__(self, api, obj=None, parent=None):
         super().__init__(obj if obj else {})
         assert isinstance(api, FortifySSCAPI), 'Wrong parameter type, api should be FortifySSCAPI'
@@ -79,15 +153,59 @@ class SSCObject(dict):
         if not self.is_instance():
             raise NotAnInstanceException(msg)
 
+    def _project(self, kwargs):
+        """
+        Resolve the `fields` query parameter, a preset name from `FIELDS` or a list of field names, into the comma
+        separated list SSC expects, so only those attributes are sent back
+        """
+        fields = kwargs.get('fields')
+        if fields is None:
+            return kwargs
+        if isinstance(fields, str):
+            fields = self.FIELDS.get(fields, fields)
+        if not isinstance(fields, str):
+            fields = ','.join(fields)
+        kwargs['fields'] = fields
+        return kwargs
+
+    def _listing(self, endpoint, kwargs, records=False, columns=None):
+        """
+        Page through `endpoint`, yielding instances of this class or, when asked, compact records or column batches
+        of the `fields` (the 'lite' preset by default), see py:mod:`fortifyapi.records`
+        """
+        if records or columns:
+            kwargs.setdefault('fields', 'lite')
+        kwargs = self._project(kwargs)
+        with self._api as api:
+            rows = api.page_data(endpoint, **kwargs)
+            if columns:
+                yield from to_columns(rows, kwargs['fields'].split(','), columns)
+            elif records:
+                yield from to_records(rows, f"{type(self).__name__}Record", kwargs['fields'].split(','))
+            else:
+                for e in rows:
+                    yield type(self)(self._api, e, self.parent)
 
-class Version(SSCObject):
 
-    def __init__(self, api, obj, parent):
-        super().__init__(api, obj, parent)
-        self.attributes = Attribute(api, obj, self)
-        self.issues = Issue(api, obj, self)
-        self.custom_tags = CustomTag(api, obj, self)
-        self.artifacts = Artifact(api, obj, self)
+class Version(SSCObject):
+    FIELDS = {
+        'lite': ('id', 'name', 'project', 'active', 'committed'),
+    }
+    attributes = _Child('Attribute')
+    issues = _Child('Issue')
+    custom_tags = _Child('CustomTag')
+    artifacts = _Child('Artifact')
+    # only some fields were read, e.g. from the name index, the rest are fetched when first used
+    _partial = False
+
+    def __missing__(self, key):
+        if self._partial and 'id' in self:
+            self._partial = False
+            with self._api as api:
+                self.update(api.get(f"/api/v1/projectVersions/{self['id']}")['data'])
+            if key in self:
+                return dict.__getitem__(self, key)
+        raise KeyError(key)
 
     def initialize(self, template=DefaultVersionTemplate):
         """
@@ -126,13 +244,13 @@ class Version(SSCObject):
         if not self.parent:
             raise ParentNotFoundException("No project parent found to query versions from")
         with self._api as api:
-            for e in api.page_data(f"/api/v1/projects/{self.parent['id']}/versions", **kwargs):
+            for e in api.page_data(f"/api/v1/projects/{self.parent['id']}/versions", **self._project(kwargs)):
                 p = Project(self._api, e['project'], None) if 'project' in e else self.parent
                 yield Version(self._api, e, p)
 
     def search(self, **kwargs):
         with self._api as api:
-            for e in api.page_data(f"/api/v1/projectVersions", **kwargs):
+            for e in api.page_data(f"/api/v1/projectVersions", **self._project(kwargs)):
                 p = Project(self._api, e['project'], None) if 'project' in e else self.parent
                 yield Version(self._api, e, p)
 
@@ -151,10 +269,18 @@ class Version(SSCObject):
             return
 
     def delete(self):
-        """ Delete the current version """
+        """ Delete the current version, batched inside py:func:`FortifySSCAPI.batch` """
         self.assert_is_instance()
         with self._api as api:
-            return api.delete(f"/api/v1/projectVersions/{self['id']}")
+            r = api.submit('DELETE', f"/api/v1/projectVersions/{self['id']}")
+            if api.names is not None:
+                names, vid = api.names, self['id']
+                if isinstance(r, Future):
+                    # batched, forget it only once it is gone
+                    r.add_done_callback(lambda f: f.exception() is None and names.remove(vid))
+                else:
+                    names.remove(vid)
+            return r
 
     def get_processing_rules(self, **kwargs):
         self.assert_is_instance()
@@ -162,9 +288,10 @@ class Version(SSCObject):
             return api.get(f"/api/v1/projectVersions/{self['id']}/resultProcessingRules", **kwargs)
 
     def set_processing_rules(self, rules):
+        """ Batched inside py:func:`FortifySSCAPI.batch` """
         self.assert_is_instance()
         with self._api as api:
-            return api.put(f"/api/v1/projectVersions/{self['id']}/resultProcessingRules", rules)
+            return api.submit('PUT', f"/api/v1/projectVersions/{self['id']}/resultProcessingRules", rules)
 
     def issue_summary(self, series_type='DEFAULT', group_axis_type='ISSUE_FOLDER'):
         self.assert_is_instance()
@@ -173,6 +300,52 @@ class Version(SSCObject):
                            seriestype=series_type,
                            groupaxistype=group_axis_type)['data']
 
+    def diff(self, other, group_by='friority', ids=True, **kwargs) -> dict:
+        """
+        Compare the issues of this version with those of `other`, e.g. a pull request version with its baseline,
+        matched on `issueInstanceId`. Both sides are streamed with only the fields needed, and only this side's
+        instance ids are held while the other side streams by.
+
+        :param other: The version, or its id, to compare with
+        :param group_by: The issue field the counts are grouped by
+        :param ids: Also return the sets of instance ids, False for just the counts
+        :param kwargs: Query parameters for both issue listings, e.g. `showsuppressed=True`, other than `fields`
+                       and `limit` which diff sets itself
+        :returns: `{'counts': {'new': {group: n}, 'removed': {...}, 'unchanged': {...}}}` plus, with `ids`, the
+                  `new`, `removed` and `unchanged` sets. New issues are only in this version, removed ones only
+                  in `other`.
+        """
+        self.assert_is_instance()
+        assert not {'fields', 'limit'} & set(kwargs), "diff sets the fields and limit of the listings itself"
+        other_id = other['id'] if isinstance(other, dict) else other
+        fields = f"issueInstanceId,{group_by}"
+        counts = dict(new={}, removed={}, unchanged={})
+        removed, unchanged = set(), set()
+        with self._api as api:
+            mine, groups = {}, {}
+            for e in api.page_data(f"/api/v1/projectVersions/{self['id']}/issues", fields=fields, limit=-1,
+                                   **kwargs):
+                group = e.get(group_by)
+                mine[e['issueInstanceId']] = groups.setdefault(group, group)
+            for e in api.page_data(f"/api/v1/projectVersions/{other_id}/issues", fields=fields, limit=-1,
+                                   **kwargs):
+                iid = e['issueInstanceId']
+                if iid in mine:
+                    key, group = 'unchanged', mine.pop(iid)
+                    if ids:
+                        unchanged.add(iid)
+                else:
+                    key, group = 'removed', e.get(group_by)
+                    if ids:
+                        removed.add(iid)
+                counts[key][group] = counts[key].get(group, 0) + 1
+        for group in mine.values():
+            counts['new'][group] = counts['new'].get(group, 0) + 1
+        result = dict(counts=counts)
+        if ids:
+            result.update(new=set(mine), removed=removed, unchanged=unchanged)
+        return result
+
     def test(self, application_name: str, version_name: str) -> bool:
         """
         Check whether the specified application name is already defined in the system
@@ -192,16 +365,21 @@ class Version(SSCObject):
             return b
         
     def set_bugtracker(self, bugtracker):
-        with self._api as api:
-            b = api.put_array(f"/api/v1/projectVersions/{self['id']}/bugtracker", [bugtracker])['data'][0]['bugTracker']
+        """ Batched inside py:func:`FortifySSCAPI.batch` """
+        def to_bugtracker(r):
+            b = r['data'][0]['bugTracker']
             if b is not None:
-                return Bugtracker(self._api, b, self)   
+                return Bugtracker(self._api, b, self)
             return b
 
+        with self._api as api:
+            return api.submit('PUT', f"/api/v1/projectVersions/{self['id']}/bugtracker", [bugtracker], to_bugtracker)
+
     def upload_artifact(self, file_path, process_block=False, engine_type=None, timeout=None):
         """
         Upload an artifact to an SSC version. Supports streaming as to allow extremely large artifact uploads.
-        
+        For many artifacts at once see py:class:`fortifyapi.uploader.ArtifactUploader`.
+
         :param process_block: Block this method for Artifact processing
         :param engine_type: str To specify the parser to be used to process this artifact, see /ssc/html/ssc/admin/parserplugins
         :param timeout: int Used if blocking, in how many seconds we should timeout and throw an Exception. Default is never.
@@ -209,17 +387,20 @@ class Version(SSCObject):
         self.assert_is_instance()
         with self._api as api:
             query = dict(engineType=engine_type) if engine_type else {}
-            m = MultipartEncoder(fields={'file': (basename(file_path), open(file_path, 'rb'), 'application/zip')})
-            h = {'Content-Type': m.content_type}
-            robj = api._request('POST', f"/api/v1/projectVersions/{self['id']}/artifacts", data=m, params=query, headers=h)
+            with open(file_path, 'rb') as f:
+                m = MultipartEncoder(fields={'file': (basename(file_path), f, 'application/zip')})
+                h = {'Content-Type': m.content_type}
+                robj = api._request('POST', f"/api/v1/projectVersions/{self['id']}/artifacts", data=m, params=query, headers=h)
             art = Artifact(self._api, robj['data'], self)
             now = time.time()
+            delay = 1
             if process_block:
                 while True:
                     a = art.get(art['id'])
                     if a['status'] in ['PROCESS_COMPLETE', 'ERROR_PROCESSING', 'REQUIRE_AUTH']:
                         return a
-                    time.sleep(1)
+                    time.sleep(delay)
+                    delay = min(delay * 2, 30)
                     if timeout and (time.time() - now) > timeout:
                         raise TimeoutError("Upload artifact was blocking and exceeded the timeout")
             return art
@@ -230,9 +411,16 @@ class Version(SSCObject):
         token = FileToken(self._api, None, self).create(purpose='DOWNLOAD')
         return f"{self._api.url}/download/currentStateFprDownload.html?mat={token['token']}&id={self['id']}&clientVersion=24.2.0.0186&includeSource={includeSource}"
 
-    def download(self, includeSource=True):
+    def download(self, includeSource=True, *, dest, **kwargs) -> dict:
+        """
+        Stream the current version as fpr to `dest`, a path or binary file object, with a fresh file token for
+        every resume. `dest` is keyword only, so calls of the former `download(includeSource)` fail loudly.
+
+        :param kwargs: See py:func:`FortifySSCAPI.download`, e.g. `checksum='sha256'`
+        """
+        self.assert_is_instance()
         with self._api as api:
-            return api.get(self.download_url(includeSource))
+            return api.download(lambda: self.download_url(includeSource), dest, **kwargs)
 
     def purge(self, purgeBefore, projectVersionIds=None):
         """
@@ -245,12 +433,111 @@ class Version(SSCObject):
         with self._api as api:
             return api.post('/api/v1/projectVersions/action/purge', {'projectVersionIds': projectVersionIds, 'purgeBefore': purgeBefore})
 
+    def delete_many(self, versions, size=100, rate=None) -> dict:
+        """
+        Delete many versions through `/api/v1/bulk`, `size` per request
 
-class Project(SSCObject):
+        :param versions: Versions, or version ids
+        :param rate: The most versions deleted per second, None for no cap
+        :returns: `{'deleted': [version ids], 'failed': {version id: error}, 'seconds': float}`
+        """
+        ids = [v['id'] if isinstance(v, dict) else v for v in versions]
+        result = dict(deleted=[], failed={})
+        started = time.monotonic()
+        with self._api as api:
+            for start in range(0, len(ids), size):
+                if rate:
+                    time.sleep(max(0.0, start / rate - (time.monotonic() - started)))
+                with api.batch(size=size):
+                    futures = {vid: Version(self._api, {'id': vid}, self.parent).delete()
+                               for vid in ids[start:start + size]}
+                for vid, future in futures.items():
+                    if future.exception() is None:
+                        result['deleted'].append(vid)
+                    else:
+                        result['failed'][vid] = str(future.exception())
+        result['seconds'] = time.monotonic() - started
+        return result
+
+    def collect_garbage(self, created_before=None, uploaded_before=None, name=None, project=None, dry_run=False,
+                        size=100, rate=None, **kwargs) -> dict:
+        """
+        Delete the versions that match every criterion given, e.g. the pull request copies that saw no scan for a
+        month, with py:func:`delete_many`
+
+            client.versions.collect_garbage(name='PR-*', uploaded_before=timedelta(days=30), rate=20)
+
+        On `project.versions` only that project's versions are considered.
+
+        :param created_before: A datetime, or a timedelta back from now. Naive datetimes are taken as UTC.
+        :param uploaded_before: Likewise for the last FPR upload, the creation date of versions never uploaded to.
+        Versions without the date are kept.
+        :param name: A glob the version name must match, e.g. `PR-*`
+        :param project: A glob the project name must match
+        :param dry_run: Only select the versions, delete nothing
+        :param kwargs: Further query parameters of the version listing
+        :returns: The py:func:`delete_many` summary plus `selected`, a dict of `id`, `project`, `name`,
+                  `creationDate` and `lastFprUploadDate` per version
+        """
+        assert any(c is not None for c in (created_before, uploaded_before, name, project)), \
+            "Need at least one criterion, refusing to delete every version"
+        created_before, uploaded_before = _cutoff(created_before), _cutoff(uploaded_before)
+        q = Query()
+        if name is not None:
+            q.query('name', name)
+        if project is not None:
+            q.query('project.name', project)
+        if str(q):
+            kwargs['q'] = q
+        kwargs.update(fields='id,name,project,creationDate,currentState', limit=-1)
+        if isinstance(self.parent, Project) and self.parent.is_instance():
+            endpoint = f"/api/v1/projects/{self.parent['id']}/versions"
+        else:
+            endpoint = '/api/v1/projectVersions'
+        selected = []
+        with self._api as api:
+            for e in api.page_data(endpoint, **kwargs):
+                project_name = (e.get('project') or {}).get('name')
+                if project_name is None and isinstance(self.parent, Project):
+                    project_name = self.parent['name']
+                created = e.get('creationDate')
+                uploaded = (e.get('currentState') or {}).get('lastFprUploadDate')
+                # SSC wildcards ignore case, globs here do not
+                if name is not None and not fnmatchcase(e['name'], name):
+                    continue
+                if project is not None and (project_name is None or not fnmatchcase(project_name, project)):
+                    continue
+                # without the date it is judged by, a version is never old enough
+                if created_before is not None and (created is None or _ssc_datetime(created) >= created_before):
+                    continue
+                if uploaded_before is not None and \
+                        ((uploaded or created) is None or _ssc_datetime(uploaded or created) >= uploaded_before):
+                    continue
+                selected.append(dict(id=e['id'], project=project_name, name=e['name'], creationDate=created,
+                                     lastFprUploadDate=uploaded))
+            if dry_run:
+                result = dict(deleted=[], failed={}, seconds=0.0)
+            else:
+                result = self.delete_many([v['id'] for v in selected], size=size, rate=rate)
+        result['selected'] = selected
+        return result
+
+
+def _cutoff(when):
+    if isinstance(when, timedelta):
+        return datetime.now(timezone.utc) - when
+    if isinstance(when, datetime) and when.tzinfo is None:
+        return when.replace(tzinfo=timezone.utc)
+    return when
 
-    def __init__(self, api, obj=None, parent=None):
-        super().__init__(api, obj, parent)
-        self.versions = Version(api, None, self)
+
+def _ssc_datetime(value):
+    """ e.g. `2023-01-31T13:37:00.000+0000` """
+    return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f%z')
+
+
+class Project(SSCObject):
+    versions = _Child('Version')
 
     def list(self, **kwargs):
         """
@@ -307,20 +594,9 @@ class Project(SSCObject):
         :rtype: fortifyapi.Version or bool
         """
         with self._api as api:
-            r = api.post(f"/api/v1/projectVersions", {
-                'name': version_name,
-                'description': description,
-                'active': active,
-                'committed': committed,
-                'project': {
-                    'id': project_id,  # if this is None it will create the project
-                    'name': project_name,
-                    'description': description,
-                    'issueTemplateId': issue_template_id
-                },
-                'issueTemplateId': issue_template_id,
-                'dataRetentionPolicyOverride': dataRetentionPolicyOverride
-            })
+            r = api.post(f"/api/v1/projectVersions", self._version_payload(
+                project_name, version_name, project_id, description, active, committed, issue_template_id,
+                dataRetentionPolicyOverride))
             p = Project(self._api, r['data']['project'], None) if 'project' in r['data'] else self
 
             v = Version(self._api, r['data'], p)
@@ -328,7 +604,108 @@ class Project(SSCObject):
             # get it again, so we see it's true state
             # we should really just re-get the Project, so it has all the proper data
             p = Project(self._api, {}, None).get(p['id'])
-            return p.versions.get(v['id'])
+            v = p.versions.get(v['id'])
+            if api.names is not None:
+                api.names.add(v)
+            return v
+
+    @staticmethod
+    def _version_payload(project_name, version_name, project_id, description, active, committed, issue_template_id,
+                         dataRetentionPolicyOverride):
+        return {
+            'name': version_name,
+            'description': description,
+            'active': active,
+            'committed': committed,
+            'project': {
+                'id': project_id,  # if this is None it will create the project
+                'name': project_name,
+                'description': description,
+                'issueTemplateId': issue_template_id
+            },
+            'issueTemplateId': issue_template_id,
+            'dataRetentionPolicyOverride': dataRetentionPolicyOverride
+        }
+
+    def create_many(self, versions, description="Created on " + str(date.today()) + " from " + gethostname(),
+                    active=True, committed=False, issue_template_id='Prioritized-HighRisk-Project-Template',
+                    template=DefaultVersionTemplate, dataRetentionPolicyOverride=False, size=100) -> dict:
+        """
+        py:func:`create` for many versions at once, e.g. when onboarding a business unit
+
+            result = client.projects.create_many([('app1', 'main'), ('app1', 'develop'), ('app2', 'main')])
+
+        Rather than four round trips per version this takes a handful overall: one listing finds the projects
+        that exist, the versions are created through `/api/v1/bulk` (the first version of each new project, then
+        the rest with the new project ids), the requests of every version's `template` are sent `size` at a time
+        in bulk requests, and the results are read back with listings of `id` or-queries.
+
+        :param versions: (project name, version name) pairs, versions that already exist fail
+        :param size: The most sub-requests per bulk request
+        :returns: `{'created': [Versions in the order given], 'failed': {(project name, version name): error}}`
+        """
+        pairs = list(dict.fromkeys((p, v) for p, v in versions))
+        if not isinstance(template, DefaultVersionTemplate):
+            template = template()
+        failed, created = {}, {}
+
+        def post(api, pairs, project_ids):
+            futures = {}
+            with api.batch(size=size) as batch:
+                for pair in pairs:
+                    futures[pair] = batch.add('POST', '/api/v1/projectVersions', self._version_payload(
+                        pair[0], pair[1], project_ids.get(pair[0]), description, active, committed,
+                        issue_template_id, dataRetentionPolicyOverride), transform=lambda body: body['data'])
+            for pair, future in futures.items():
+                try:
+                    created[pair] = future.result()
+                except ResponseException as e:
+                    failed[pair] = str(e)
+
+        with self._api as api:
+            project_ids = {}
+            names = list(dict.fromkeys(p for p, _ in pairs))
+            for start in range(0, len(names), 50):
+                q = Query.any_of('name', names[start:start + 50])
+                for e in api.page_data('/api/v1/projects', q=q, fields='id,name', limit=-1):
+                    project_ids[e['name']] = e['id']
+
+            # a new project is made by its first version, its other versions need its id
+            first = {}
+            for pair in pairs:
+                if pair[0] not in project_ids:
+                    first.setdefault(pair[0], pair)
+            post(api, list(first.values()) + [pair for pair in pairs if pair[0] in project_ids], project_ids)
+            for pair in first.values():
+                if pair in created:
+                    project_ids[pair[0]] = created[pair]['project']['id']
+            rest = [pair for pair in pairs if pair not in created and pair not in failed]
+            post(api, [pair for pair in rest if pair[0] in project_ids], project_ids)
+            for pair in rest:
+                if pair[0] not in project_ids:
+                    failed[pair] = f"Application {pair[0]} was not created"
+
+            futures = {}
+            with api.batch(size=size) as batch:
+                for pair, data in created.items():
+                    futures[pair] = [batch.add_request(r) for r in template.generate(api=api,
+                                                                                     project_version_id=data['id'])]
+            for pair, fs in futures.items():
+                errors = [f.exception() for f in fs if f.exception() is not None]
+                if errors:
+                    failed[pair] = str(errors[0])
+
+            ids = [created[pair]['id'] for pair in pairs if pair in created and pair not in failed]
+            found = {}
+            for start in range(0, len(ids), 50):
+                q = Query.any_of('id', ids[start:start + 50])
+                for e in api.page_data('/api/v1/projectVersions', q=q, limit=-1):
+                    found[e['id']] = Version(self._api, e, Project(self._api, e['project'], None))
+                    if api.names is not None:
+                        api.names.add(e)
+        return dict(created=[found[created[pair]['id']] for pair in pairs
+                             if pair in created and pair not in failed and created[pair]['id'] in found],
+                    failed=failed)
 
     def upsert(self, project_name, version_name, description="Created on " + str(date.today())
                + " from " + gethostname(), active=True,
@@ -337,6 +714,10 @@ class Project(SSCObject):
         """
         Implements the Project().create, but will test/ query if project exists, if not it will
         create both Project and version.  A project is dependent on at least one version associated to it.
+
+        With a py:class:`fortifyapi.names.NameIndex` on the client an existing version is returned without a
+        request, with only the fields in `NameIndex.FIELDS`, and a known project saves its lookups. The first
+        `version[key]` of any other field reads the whole version.
         """
         def _find_project_version(pname, pver=None):
             q = Query().query("project.name", pname)
@@ -352,30 +733,46 @@ class Project(SSCObject):
                 return version
             return None
 
-        if self.test(application_name=project_name) is False:
+        names, project = self._api.names, None
+        if names is not None:
+            names.warm(self._api)
+            found = names.version(project_name, version_name)
+            if found is not None:
+                version = Version(self._api, found, Project(self._api, found['project'], None))
+                version._partial = True
+                return version
+            project = names.project(project_name)
+
+        if project is None and self.test(application_name=project_name) is False:
             return self.create(project_name, version_name, description=description, active=active,
                                committed=committed, issue_template_id=issue_template_id, template=template)
         elif self.versions.test(project_name, version_name) is False:
             # just need to make version, but use the projectVersions endpoint as it does not contain the unicode bug
-            project_version = _find_project_version(project_name)
-            if not project_version:
-                raise ParentNotFoundException(f"Somehow `{project_name}` exists yet we cannot query for it")
-            return self.create(project_name, version_name, project_id=project_version['project']['id'], description=description,
+            if project is None:
+                project_version = _find_project_version(project_name)
+                if not project_version:
+                    raise ParentNotFoundException(f"Somehow `{project_name}` exists yet we cannot query for it")
+                project = project_version['project']
+            return self.create(project_name, version_name, project_id=project['id'], description=description,
                                active=active, committed=committed, issue_template_id=issue_template_id,
                                template=template)
         else:
             version = _find_project_version(project_name, version_name)
             if version:
+                if names is not None:
+                    names.add(version)
                 return version
             else:
                 raise ParentNotFoundException(f"Somehow `{project_name}` - `{version_name}` exists yet we cannot query for it")
 
 
-    def delete(self):
+    def delete(self, size=100):
         # delete every version and project will delete
         self.assert_is_instance()
-        for v in self.versions.list():
-            v.delete()
+        result = self.versions.delete_many(list(self.versions.list(fields='id')), size=size)
+        if result['failed']:
+            raise ResponseException(f"Could not delete versions of {self['name']}: {result['failed']}")
+        return result
 
 
 class Engine(SSCObject):
@@ -491,11 +888,31 @@ class CloudJob(SSCObject):
         'submitterUserName': str
     })
     """
+    FIELDS = {
+        'lite': ('jobToken', 'jobState', 'pvId', 'pvName', 'projectName', 'jobQueuedTime', 'jobFinishedTime'),
+    }
+    # a job in one of these states does not change anymore
+    TERMINAL_STATES = ('UPLOAD_COMPLETED', 'UPLOAD_FAILED', 'UPLOAD_CANCELED', 'SCAN_FAILED', 'SCAN_FAULTED',
+                       'SCAN_TIMEOUT', 'SCAN_CANCELED', 'INVALID')
+    ACTIVE_STATES = ('PENDING', 'IN_PROGRESS', 'SCAN_RUNNING', 'SCAN_COMPLETED', 'UPLOAD_QUEUED', 'CANCELING')
+
+    def list(self, records=False, columns=None, **kwargs):
+        """
+        :param records: Yield compact namedtuples of the `fields` instead of CloudJobs, see py:func:`upgrade`
+        :param columns: Yield `{field: column}` batches of up to this many jobs instead of CloudJobs
+        :param kwargs: The request query parameters, `fields` may also be a list or a preset name from `FIELDS`
+        """
+        return self._listing(f"/api/v1/cloudjobs", kwargs, records, columns)
 
-    def list(self, **kwargs):
-        with self._api as api:
-            for e in api.page_data(f"/api/v1/cloudjobs", **kwargs):
-                yield CloudJob(self._api, e, self.parent)
+    def upgrade(self, record, fetch=True):
+        """
+        Turn a record from py:func:`list` back into a CloudJob
+
+        :param fetch: Get the full job from SSC, otherwise the CloudJob only has the record's fields
+        """
+        if fetch:
+            return self.get(record.jobToken)
+        return CloudJob(self._api, record._asdict(), self.parent)
 
     def list_all(self, **kwargs):
         """ Helper function to just disable paging and get them all """
@@ -507,17 +924,212 @@ class CloudJob(SSCObject):
         with self._api as api:
             return CloudJob(self._api, api.get(f"/api/v1/cloudjobs/{job_token}")['data'], self.parent)
 
-    def cancel(self, job_token: str):
+    def watch(self, interval=30, since=None, callback=None, page_size=50) -> 'CloudJobWatcher':
+        """
+        Follow the state changes of jobs without listing them all every time, e.g.
+
+            for event in client.cloudjobs.watch(interval=10):
+                print(event.token, event.previous, '->', event.state)
+
+        See py:class:`CloudJobWatcher`
+        """
+        return CloudJobWatcher(self, interval, since, callback, page_size)
+
+    def cancel(self, job_token: str = None):
         """
         Manage ScanCentral SAST jobs with state change to CANCEL.  Typical usage
-        would be of a large backlog of PENDING jobs, because no sensor was available or is in a bad state.
-        :param job_token: Scan Central Job Token assigned to the job
+        would be of a large backlog of PENDING jobs, because no sensor was available or is in a bad state, for
+        which see py:func:`cancel_many`.
+        :param job_token: Scan Central Job Token assigned to the job, defaults to this job's
         TODO: fix with return api.post(f"/api/v1/cloudjobs/{job_token}/acion", type="cancel")['data']['status'].  See
         POST /ssc/api/v1/cloudjobs/1076964f-ec72-48e1-a897-6da9683a75df/action HTTP/1.1
         {"type":"cancel"}
         """
+        if job_token is None:
+            self.assert_is_instance()
+            job_token = self['jobToken']
         with self._api as api:
-            return api.post(f"/api/v1/cloudjobs/action/cancel", jobTokens=[self['jobToken']])
+            return api.post(f"/api/v1/cloudjobs/action/cancel", jobTokens=[job_token])
+
+    def cancel_many(self, jobs=None, q=None, chunk_size=500, workers=4) -> dict:
+        """
+        Cancel many jobs, `chunk_size` tokens per request, e.g. the backlog of a dead sensor
+
+            client.cloudjobs.cancel_many(q='jobState:PENDING')
+
+        The requests go `workers` at a time through the api's limiter, if it has one. When a request is rejected,
+        e.g. for a token SSC does not know, its tokens are split in halves and sent again until the tokens at fault
+        are found, so one bad token does not fail the rest.
+
+        :param jobs: Job tokens, or jobs or records with a `jobToken`
+        :param q: Instead of `jobs`, cancel the jobs this query matches. They are streamed from one listing and
+                  those that are not `jobCancellable` are skipped.
+        :returns: `{'canceled': [tokens], 'skipped': [tokens], 'failed': {token: error}}`, in the order the requests
+                  complete. SSC accepting the cancel of a job does not mean it is canceled yet, see py:func:`watch`.
+        """
+        assert (jobs is None) != (q is None), "Give either jobs or q"
+        result = dict(canceled=[], skipped=[], failed={})
+
+        def tokens():
+            if q is None:
+                for job in jobs:
+                    if isinstance(job, str):
+                        yield job
+                    else:
+                        yield job['jobToken'] if isinstance(job, dict) else job.jobToken
+                return
+            for e in api.page_data('/api/v1/cloudjobs', q=q, fields='jobToken,jobCancellable', limit=-1):
+                if e.get('jobCancellable', True):
+                    yield e['jobToken']
+                else:
+                    result['skipped'].append(e['jobToken'])
+
+        def chunks():
+            chunk = []
+            for token in tokens():
+                chunk.append(token)
+                if len(chunk) >= chunk_size:
+                    yield chunk
+                    chunk = []
+            if chunk:
+                yield chunk
+
+        def send(chunk):
+            try:
+                api.post('/api/v1/cloudjobs/action/cancel', jobTokens=chunk)
+                return {token: None for token in chunk}
+            except (ResponseException, ResourceNotFound) as e:
+                # only a rejected request tells us something about its tokens, not a server error
+                if len(chunk) == 1 or e.status is None or not 400 <= e.status <= 499:
+                    return {token: str(e) for token in chunk}
+                return {**send(chunk[:len(chunk) // 2]), **send(chunk[len(chunk) // 2:])}
+
+        def collect(futures):
+            for future in futures:
+                for token, error in future.result().items():
+                    if error is None:
+                        result['canceled'].append(token)
+                    else:
+                        result['failed'][token] = error
+
+        with self._api as api:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # submit as the listing streams in, but only so far ahead of the requests actually sent
+                in_flight = set()
+                for chunk in chunks():
+                    if len(in_flight) >= workers * 2:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        collect(done)
+                    in_flight.add(executor.submit(send, chunk))
+                collect(wait(in_flight)[0])
+        return result
+
+JobEvent = namedtuple('JobEvent', ('token', 'previous', 'state', 'job'))
+
+
+class CloudJobWatcher:
+    """
+    Turns polls of `/api/v1/cloudjobs` into a feed of `JobEvent(token, previous state, state, job)`, made by
+    py:func:`CloudJob.watch`. Each py:func:`poll`
+
+    - lists the jobs newest first and stops at the `jobQueuedTime` watermark of the last poll, so only jobs queued
+      since are read, and reports them with `previous` None
+    - re-reads the jobs it saw in one of the `ACTIVE_STATES` by `jobToken`, 50 per query, and reports those whose
+      `jobState` changed. Jobs in `TERMINAL_STATES` are dropped.
+
+    The first poll reports the jobs active at the time, and those queued after `since` if given. Only the `lite`
+    fields are requested. States a job passed through between two polls are not seen, so PENDING may go straight
+    to UPLOAD_COMPLETED.
+
+    Iterate over the watcher to poll every `interval` seconds forever, or call py:func:`poll` yourself.
+    """
+
+    def __init__(self, jobs, interval=30, since=None, callback=None, page_size=50):
+        """
+        :param jobs: The py:class:`CloudJob` collection, e.g. `client.cloudjobs`
+        :param interval: Seconds between the polls of the iterator
+        :param since: A datetime, or a timedelta back from now, report the jobs queued after it on the first poll
+        :param callback: Also called with each event
+        :param page_size: How many jobs are listed per request when looking for new ones
+        """
+        self.jobs = jobs
+        self.interval = interval
+        self.callback = callback
+        self.page_size = page_size
+        self.polls = 0
+        # token: state of the jobs that may still change
+        self.active = {}
+        self.watermark = _cutoff(since)
+        # the tokens queued exactly at the watermark, they are not new the next time
+        self._at_watermark = set()
+        self._fields = ','.join(CloudJob.FIELDS['lite'])
+
+    def __iter__(self):
+        while True:
+            yield from self.poll()
+            time.sleep(self.interval)
+
+    def poll(self) -> list:
+        """
+        :returns: The events since the last poll, oldest job first
+        """
+        events = []
+        with self.jobs._api as api:
+            if self.polls == 0:
+                for e in api.page_data('/api/v1/cloudjobs', q=Query.any_of('jobState', CloudJob.ACTIVE_STATES),
+                                       fields=self._fields, limit=-1):
+                    events.append(self._event(e, None))
+            new = self._new(api, since_start=self.polls == 0 and self.watermark is None)
+            seen = {event.token for event in events}
+            events.extend(self._event(e, None) for e in reversed(new) if e['jobToken'] not in seen)
+
+            stale = [token for token in self.active if token not in seen | {e['jobToken'] for e in new}]
+            for start in range(0, len(stale), 50):
+                found = {}
+                for e in api.page_data('/api/v1/cloudjobs', q=Query.any_of('jobToken', stale[start:start + 50]),
+                                       fields=self._fields, limit=-1):
+                    found[e['jobToken']] = e
+                for token in stale[start:start + 50]:
+                    if token not in found:
+                        # deleted
+                        self.active.pop(token, None)
+                    elif found[token]['jobState'] != self.active[token]:
+                        events.append(self._event(found[token], self.active[token]))
+        self.polls += 1
+        if self.callback:
+            for event in events:
+                self.callback(event)
+        return events
+
+    def _new(self, api, since_start):
+        """ The jobs queued since the watermark, newest first, and move the watermark up to them """
+        new = []
+        for e in api.page_data('/api/v1/cloudjobs', orderby='-jobQueuedTime', fields=self._fields,
+                               limit=1 if since_start else self.page_size):
+            queued = _ssc_datetime(e['jobQueuedTime'])
+            if since_start:
+                # start from the newest job, the active ones were read already
+                self.watermark, self._at_watermark = queued, {e['jobToken']}
+                return []
+            if self.watermark is not None and queued < self.watermark:
+                break
+            if queued == self.watermark and e['jobToken'] in self._at_watermark:
+                continue
+            new.append(e)
+        if new:
+            newest = _ssc_datetime(new[0]['jobQueuedTime'])
+            if self.watermark is None or newest > self.watermark:
+                self.watermark, self._at_watermark = newest, set()
+            self._at_watermark.update(e['jobToken'] for e in new if _ssc_datetime(e['jobQueuedTime']) == newest)
+        return new
+
+    def _event(self, e, previous):
+        token, state = e['jobToken'], e['jobState']
+        if state in CloudJob.TERMINAL_STATES:
+            self.active.pop(token, None)
+        else:
+            self.active[token] = state
+        return JobEvent(token, previous, state, CloudJob(self.jobs._api, e, self.jobs.parent))
 
 
 class Scan(SSCObject):
@@ -527,25 +1139,22 @@ class Scan(SSCObject):
 
     def list(self, **kwargs):
         with self._api as api:
-            for e in api.page_data(f"/api/v1/artifacts/{self['id']}/scans", **kwargs):
-                yield Scan(self._api, e, self)
+            for e in api.page_data(f"/api/v1/artifacts/{self.parent['id']}/scans", **kwargs):
+                yield Scan(self._api, e, self.parent)
 
 
 class Artifact(SSCObject):
-
-    def __init__(self, api, obj=None, parent=None):
-        super().__init__(api, obj, parent)
-        self.scans = Scan(api, None, self)
+    scans = _Child('Scan')
 
     def get(self, id):
         with self._api as api:
             return Artifact(self._api, api.get(f"/api/v1/artifacts/{id}")['data'], self.parent)
 
     def list(self, **kwargs):
-        self.assert_is_instance()
+        self.parent.assert_is_instance()
         with self._api as api:
-            for e in api.page_data(f"/api/v1/projectVersions/{self['id']}/artifacts", **kwargs):
-                yield Artifact(self._api, e, self)
+            for e in api.page_data(f"/api/v1/projectVersions/{self.parent['id']}/artifacts", **kwargs):
+                yield Artifact(self._api, e, self.parent)
 
     def delete(self, id):
         f"/api/v1/artifacts/{id}" # DELETE
@@ -561,9 +1170,13 @@ class Artifact(SSCObject):
         token = FileToken(self._api, None, self).create(purpose='DOWNLOAD')
         return f"{self._api.url}/download/artifactDownload.html?mat={token['token']}&id={self['id']}&includeSource={includeSource}"
 
-    def download(self, includeSource=True):
+    def download(self, includeSource=True, *, dest, **kwargs) -> dict:
+        """
+        Stream the artifact to `dest`, a path or binary file object, see py:func:`Version.download`
+        """
+        self.assert_is_instance()
         with self._api as api:
-            return api.get(self.download_url(includeSource))
+            return api.download(lambda: self.download_url(includeSource), dest, **kwargs)
 
 
 class Issue(SSCObject):
@@ -574,10 +1187,28 @@ class Issue(SSCObject):
     SUSPICIOUS = 3
     EXPLOITABLE = 4
 
-    def list(self, **kwargs):
-        with self._api as api:
-            for e in api.page_data(f"/api/v1/projectVersions/{self.parent['id']}/issues", **kwargs):
-                yield Issue(self._api, e, self.parent)
+    FIELDS = {
+        'lite': ('id', 'revision', 'issueInstanceId', 'friority', 'primaryTag'),
+    }
+
+    def list(self, records=False, columns=None, **kwargs):
+        """
+        :param records: Yield compact namedtuples of the `fields` instead of Issues, see py:func:`upgrade`
+        :param columns: Yield `{field: column}` batches of up to this many issues instead of Issues
+        :param kwargs: The request query parameters, `fields` may also be a list or a preset name from `FIELDS`
+        """
+        return self._listing(f"/api/v1/projectVersions/{self.parent['id']}/issues", kwargs, records, columns)
+
+    def upgrade(self, record, fetch=True):
+        """
+        Turn a record from py:func:`list` back into an Issue of this version
+
+        :param fetch: Get the full issue from SSC. Without it the Issue only has the record's fields, which is
+                      enough to audit or suppress it if those include `id` and `revision`.
+        """
+        if fetch:
+            return self.get(record.id)
+        return Issue(self._api, record._asdict(), self.parent)
 
     def get(self, id):
         with self._api as api:
@@ -593,6 +1224,8 @@ class Issue(SSCObject):
 
     def audit(self,  analysis, comment="via automation", user=None, suppressed=False, tags=None):
         """
+        Batched inside py:func:`FortifySSCAPI.batch`
+
         :param analysis: zero to four
         :param comment: Issue comment
         :param user: Username to assign, else None
@@ -600,6 +1233,12 @@ class Issue(SSCObject):
         :param tags: ?
         """
         self.assert_is_instance()
+        o = Issue._audit_payload([self], analysis, comment, user, suppressed, tags)
+        with self._api as api:
+            return api.submit('POST', f"/api/v1/projectVersions/{self.parent['id']}/issues/action/audit", o)
+
+    @staticmethod
+    def _audit_payload(issues, analysis, comment="via automation", user=None, suppressed=False, tags=None):
         assert analysis in [
             Issue.NOT_SET,
             Issue.NOT_AN_ISSUE,
@@ -609,10 +1248,7 @@ class Issue(SSCObject):
             Issue.EXPLOITABLE
         ], "Not a valid analysis type"
         o = {
-            'issues': [{
-                'id': self['id'],
-                'revision': self['revision']
-            }],
+            'issues': [Issue._ref(i) for i in issues],
             'comment': comment,
             'suppressed': suppressed,
             'customTagAudit': [{
@@ -628,11 +1264,17 @@ class Issue(SSCObject):
                     o['customTagAudit'].append(t)
             else:
                 o['customTagAudit'].append(tags)
+        return o
 
-        with self._api as api:
-            return api.post(f"/api/v1/projectVersions/{self.parent['id']}/issues/action/audit", o)
+    @staticmethod
+    def _ref(issue):
+        # an Issue, a dict or a record from list(records=True)
+        if isinstance(issue, dict):
+            return {'id': issue['id'], 'revision': issue['revision']}
+        return {'id': issue.id, 'revision': issue.revision}
 
     def suppress(self, suppressed=True):
+        """ Batched inside py:func:`FortifySSCAPI.batch` """
         self.assert_is_instance()
         o = {
             'issues': [{
@@ -642,10 +1284,84 @@ class Issue(SSCObject):
             "suppressed": suppressed
         }
         with self._api as api:
-            return api.post(f"/api/v1/projectVersions/{self.parent['id']}/issues/action/suppress", o)
+            return api.submit('POST', f"/api/v1/projectVersions/{self.parent['id']}/issues/action/suppress", o)
 
     def unsuppress(self):
-        self.suppress(False)
+        return self.suppress(False)
+
+    def audit_many(self, issues, analysis, comment="via automation", user=None, suppressed=False, tags=None,
+                   chunk_size=500, retries=3) -> dict:
+        """
+        Audit many issues of this version alike, `chunk_size` issues per request, e.g.
+        `version.issues.audit_many(version.issues.list(records=True), Issue.NOT_AN_ISSUE)`
+
+        When a chunk is rejected because some issues changed or were removed since they were read, the current
+        revisions of the chunk's issues are read again, with listings of just `id,revision` by id, and the chunk is
+        retried without the removed issues. Any other error is raised.
+
+        :param issues: Issues, dicts or records with an `id` and `revision`
+        :param retries: How many times a chunk is retried after a revision conflict
+        :returns: `{'updated': count, 'refreshed': count, 'failed': [issue ids]}`, failed are those no longer found
+                  or still conflicting after the retries
+        """
+        def payload(chunk):
+            return Issue._audit_payload(chunk, analysis, comment, user, suppressed, tags)
+        return self._many('audit', issues, payload, chunk_size, retries)
+
+    def suppress_many(self, issues, suppressed=True, chunk_size=500, retries=3) -> dict:
+        """
+        Suppress, or unsuppress, many issues of this version, see py:func:`audit_many`
+        """
+        def payload(chunk):
+            return {'issues': chunk, 'suppressed': suppressed}
+        return self._many('suppress', issues, payload, chunk_size, retries)
+
+    def _many(self, action, issues, payload, chunk_size, retries):
+        self.parent.assert_is_instance()
+        endpoint = f"/api/v1/projectVersions/{self.parent['id']}/issues/action/{action}"
+        refs = [Issue._ref(i) for i in issues]
+        result = dict(updated=0, refreshed=0, failed=[])
+        with self._api as api:
+            for start in range(0, len(refs), chunk_size):
+                chunk = refs[start:start + chunk_size]
+                for attempt in range(retries + 1):
+                    try:
+                        api.post(endpoint, **payload(chunk))
+                        result['updated'] += len(chunk)
+                        break
+                    except (ResourceNotFound, ResponseException):
+                        if attempt == retries:
+                            result['failed'].extend(r['id'] for r in chunk)
+                            break
+                        chunk, refreshed, gone = self._refresh(api, chunk)
+                        if not refreshed and not gone:
+                            # not a revision conflict, retrying will not help
+                            raise
+                        result['refreshed'] += refreshed
+                        result['failed'].extend(gone)
+                        if not chunk:
+                            break
+        return result
+
+    def _refresh(self, api, refs):
+        """
+        :returns: `refs` with their current revision, how many of them changed, and the ids no longer found
+        """
+        current = {}
+        for start in range(0, len(refs), 50):
+            q = Query.any_of('id', [r['id'] for r in refs[start:start + 50]])
+            for e in api.page_data(f"/api/v1/projectVersions/{self.parent['id']}/issues", q=q, fields='id,revision',
+                                   limit=-1, **SHOW_ALL):
+                current[e['id']] = e['revision']
+        fresh, refreshed, gone = [], 0, []
+        for r in refs:
+            if r['id'] not in current:
+                gone.append(r['id'])
+                continue
+            if current[r['id']] != r['revision']:
+                refreshed += 1
+            fresh.append({'id': r['id'], 'revision': current[r['id']]})
+        return fresh, refreshed, gone
 
 
 class Attachment(SSCObject):
@@ -680,19 +1396,19 @@ class Attribute(SSCObject):
 
     def list(self, **kwargs):
         with self._api as api:
-            for e in api.page_data(f"/api/v1/projectVersions/{self['id']}/attributes", **kwargs):
+            for e in api.page_data(f"/api/v1/projectVersions/{self.parent['id']}/attributes", **kwargs):
                 yield Attribute(self._api, e, self.parent)
 
     def get(self, id):
-        f"/api/v1/projectVersions/{self['id']}/attributes/{id}" # GET
+        f"/api/v1/projectVersions/{self.parent['id']}/attributes/{id}" # GET
         raise NotImplementedError()
 
     def create(self):
-        f"/api/v1/projectVersions/{self['id']}/attributes" # POST
+        f"/api/v1/projectVersions/{self.parent['id']}/attributes" # POST
         raise NotImplementedError()
 
     def update(self):
-        f"/api/v1/projectVersions/{self['id']}/attributes"  # PUT
+        f"/api/v1/projectVersions/{self.parent['id']}/attributes"  # PUT
         raise NotImplementedError()
 
 
@@ -829,15 +1545,18 @@ class AuthEntity(SSCObject):
 
     def find_ldap_user(self, username):
         with self._api as api:
-            data = api.get(f"/api/v1/authEntities", q="isLdap:true",
-                           embed='roles(name)', entityName=username, orderby='entityName',
-                           start=0, limit=-1)['data']
-            if len(data) > 0:
-                return AuthEntity(self._api, data[0], self.parent)
+            # only the first match is used, stop reading the response there
+            data = next(api.stream_data(f"/api/v1/authEntities", q="isLdap:true",
+                                        embed='roles(name)', entityName=username, orderby='entityName',
+                                        start=0, limit=-1), None)
+            if data is not None:
+                return AuthEntity(self._api, data, self.parent)
             return None
 
     def assign_to_versions(self, versions):
         """
+        Batched inside py:func:`FortifySSCAPI.batch`
+
         :rtype boolean: Succeess
         """
         self.assert_is_instance()
@@ -846,10 +1565,10 @@ class AuthEntity(SSCObject):
         else:
             cva = [versions]
         with self._api as api:
-            return api.post(f"/api/v1/authEntities/{self['id']}/projectVersions/action", {
+            return api.submit('POST', f"/api/v1/authEntities/{self['id']}/projectVersions/action", {
                 "type": "assign",
                 "ids": cva
-            })['data']['status'] == 'success'
+            }, lambda r: r['data']['status'] == 'success')
 
 
 class LocalGroup(SSCObject):
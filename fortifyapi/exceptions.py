@@ -3,7 +3,10 @@ class AuthException(Exception):
 
 
 class ResponseException(Exception):
-    pass
+    def __init__(self, *args, status=None):
+        super().__init__(*args)
+        # the HTTP status SSC answered with, None when there was no response
+        self.status = status
 
 
 class ParentNotFoundException(Exception):
@@ -15,7 +18,10 @@ class EmptyException(Exception):
 
 
 class ResourceNotFound(Exception):
-    pass
+    def __init__(self, *args, status=None):
+        super().__init__(*args)
+        # the HTTP status SSC answered with, None when there was no response
+        self.status = status
 
 
 class NotAnInstanceException(Exception):
@@ -9,16 +9,25 @@ __license__ = "MIT"
 import urllib3
 import json
 import ntpath
+import threading
 import requests
 import requests.auth
 import requests.exceptions
 import urllib.parse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from . import __version__ as version
+from .api import iter_json_items
 
 
 class FortifyApi(object):
     def __init__(self, host, username=None, password=None, token=None, verify_ssl=True, timeout=60, user_agent=None,
-                 client_version='21.10'):
+                 client_version='21.10', pool_size=10, retries=3, keep_alive=True):
+        """
+        :param pool_size: How many connections to SSC are kept open for reuse, shared by all threads
+        :param retries: How many times a connection error or a 500/502/503/504 is retried. POSTs are not retried.
+        :param keep_alive: Reuse connections across requests, set False to close each one after its response
+        """
 
         self.host = host
         self.username = username
@@ -36,6 +45,14 @@ class FortifyApi(object):
         if not self.verify_ssl:
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
+        # one connection pool for every thread, but a Session per thread as Sessions are not thread safe
+        self.keep_alive = keep_alive
+        self._adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                                    max_retries=Retry(total=retries, backoff_factor=0.1,
+                                                      status_forcelist=[500, 502, 503, 504],
+                                                      raise_on_status=False))
+        self._local = threading.local()
+
         # Set auth_type based on what's been provided
         if username is not None:
             self.auth_type = 'basic'
@@ -44,6 +61,28 @@ class FortifyApi(object):
         else:
             self.auth_type = 'unauthenticated'
 
+    @property
+    def session(self):
+        """ The requests Session of the calling thread """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            if not self.keep_alive:
+                session.headers['Connection'] = 'close'
+        return session
+
+    def close(self):
+        """ Close the pooled connections """
+        self._adapter.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
     def bulk_create_new_application_version_request(self, version_id, development_phase, development_strategy,
                                                     accessibility, business_risk_ranking, custom_attributes=[]):
         """
@@ -759,6 +798,26 @@ class FortifyApi(object):
                                                              'showshortfilenames=false'
         return self._request('GET', url)
 
+    def iter_project_version_issues(self, version_id, orderby='friority'):
+        """
+        Same issues as get_project_version_issues, but yielded one at a time while the response downloads, so even a
+        version with hundreds of thousands of issues is never held in memory at once.
+        :param version_id:
+        :param orderby: field to order the issues by
+        :return: generator of issue dicts
+        :raises requests.exceptions.RequestException: if the request fails
+        """
+        url = '/api/v1/projectVersions/' + str(version_id) + '/issues'
+        params = dict(start=0, limit=-1, orderby=orderby, showhidden='false', showremoved='false',
+                      showsuppressed='false', showshortfilenames='false')
+        response = self._request_stream('GET', url, params=params)
+        try:
+            response.raise_for_status()
+            for issue in iter_json_items(response):
+                yield issue
+        finally:
+            response.close()
+
     def get_project_version_issue_details(self, instance_id, project_name, version_name, engine='SCA'):
         """
         Returns trace analysis and other details of a given issue. The issue ID can be found from the /issues or
@@ -914,34 +973,39 @@ class FortifyApi(object):
         url = '/api/v1/projectVersions/'+str(project_version_id)+'/bugtracker'
         return self._request('PUT', url,json=bugtracker_data)
 
+    def _headers(self, headers=None, content_type=False):
+        """Default headers, unless given, plus the User-Agent"""
+        if not headers:
+            headers = {'Accept': 'application/json'}
+            if content_type:
+                headers.update({'Content-Type': 'application/json'})
+        headers.update({'User-Agent': self.user_agent})
+        return headers
+
+    def _auth(self):
+        if self.auth_type == 'basic':
+            return self.username, self.password
+        elif self.auth_type == 'token':
+            return FortifyTokenAuth(self.token)
+        return None
+
+    def _request_stream(self, method, url, params=None, headers=None):
+        """Send a request and return the raw, still unread, streaming response."""
+        return self.session.request(method=method, url=self.host + url, params=params, headers=self._headers(headers),
+                                    timeout=self.timeout, verify=self.verify_ssl, auth=self._auth(), stream=True)
+
     def _request(self, method, url, params=None, files=None, json=None, data=None, headers=None, stream=False):
         """Common handler for all HTTP requests."""
         if not params:
             params = {}
 
-        if not headers:
-            headers = {
-                'Accept': 'application/json'
-            }
-            if method == 'GET' or method == 'POST' or method == 'PUT':
-                headers.update({'Content-Type': 'application/json'})
-        headers.update({'User-Agent': self.user_agent})
+        headers = self._headers(headers, content_type=method in ('GET', 'POST', 'PUT'))
 
         try:
 
-            if self.auth_type == 'basic':
-                response = requests.request(method=method, url=self.host + url, params=params, files=files,
-                                            headers=headers, json=json, data=data,
-                                            timeout=self.timeout, verify=self.verify_ssl,
-                                            auth=(self.username, self.password), stream=stream)
-            elif self.auth_type == 'token':
-                response = requests.request(method=method, url=self.host + url, params=params, files=files,
+            response = self.session.request(method=method, url=self.host + url, params=params, files=files,
                                             headers=headers, json=json, data=data, timeout=self.timeout,
-                                            verify=self.verify_ssl, auth=FortifyTokenAuth(self.token), stream=stream)
-            else:
-                response = requests.request(method=method, url=self.host + url, params=params, files=files,
-                                            headers=headers, json=json, data=data,
-                                            timeout=self.timeout, verify=self.verify_ssl, stream=stream)
+                                            verify=self.verify_ssl, auth=self._auth(), stream=stream)
 
             try:
                 response.raise_for_status()
@@ -0,0 +1,196 @@
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from .query import Query, SHOW_ALL
+from .summary import fingerprint
+
+
+class IssueIndex:
+    """
+    A local SQLite copy of the issues of many versions, synced incrementally and queried without SSC, e.g.
+
+        with IssueIndex(client, 'issues.db') as index:
+            index.sync()
+            index.count(friority='Critical', suppressed=False)
+            index.group_by('projectName', 'friority')
+            index.filter(projectVersionId=1234, primaryTag=None)
+
+    py:func:`sync` only looks at versions whose `currentState` changed since the last sync, and of those only
+    fetches the issues that are new or whose `revision` changed. Suppressed, hidden and removed issues are
+    included, see the columns of the same name.
+    """
+    COLUMNS = {
+        'projectVersionId': 'INTEGER',
+        'id': 'INTEGER',
+        'revision': 'INTEGER',
+        'issueInstanceId': 'TEXT',
+        'projectName': 'TEXT',
+        'projectVersionName': 'TEXT',
+        'friority': 'TEXT',
+        'primaryTag': 'TEXT',
+        'issueName': 'TEXT',
+        'kingdom': 'TEXT',
+        'severity': 'REAL',
+        'likelihood': 'REAL',
+        'impact': 'REAL',
+        'engineType': 'TEXT',
+        'analyzer': 'TEXT',
+        'primaryLocation': 'TEXT',
+        'fullFileName': 'TEXT',
+        'lineNumber': 'INTEGER',
+        'suppressed': 'INTEGER',
+        'removed': 'INTEGER',
+        'hidden': 'INTEGER',
+        'audited': 'INTEGER',
+        'foundDate': 'TEXT',
+    }
+    INDEXES = ('friority', 'primaryTag', 'issueName', 'issueInstanceId')
+
+    def __init__(self, client, path=':memory:', workers=4, refetch_ratio=0.2):
+        """
+        :param client: py:class:`fortifyapi.client.FortifySSCClient`
+        :param path: The SQLite database file
+        :param workers: How many versions are fetched from SSC at the same time
+        :param refetch_ratio: Re-list a version's issues in full, instead of getting them one by one, when more
+                              than this fraction of them changed
+        """
+        self.client = client
+        self.workers = workers
+        self.refetch_ratio = refetch_ratio
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        columns = ', '.join(f'"{c}" {t}' for c, t in self.COLUMNS.items())
+        with self.db:
+            self.db.execute('CREATE TABLE IF NOT EXISTS versions '
+                            '(id INTEGER PRIMARY KEY, project TEXT, name TEXT, state TEXT, synced REAL)')
+            self.db.execute(f'CREATE TABLE IF NOT EXISTS issues ({columns}, PRIMARY KEY (projectVersionId, id))')
+            for c in self.INDEXES:
+                self.db.execute(f'CREATE INDEX IF NOT EXISTS issues_{c} ON issues ("{c}")')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+    def close(self):
+        self.db.close()
+
+    def sync(self, versions=None, progress=None) -> dict:
+        """
+        Bring the index up to date with SSC
+
+        :param versions: Version ids to sync, defaults to every version. Versions no longer in SSC are dropped
+                         from the index only when syncing every version.
+        :param progress: Called with (version id, issues fetched) as each changed version is done
+        :returns: Counts of the versions seen and changed and of the issues fetched and deleted
+        """
+        stats = dict(versions=0, changed=0, fetched=0, deleted=0)
+        known = {r['id']: r['state'] for r in self.db.execute('SELECT id, state FROM versions')}
+        current = {}
+        with self.client.api as api:
+            for v in api.page_data('/api/v1/projectVersions', fields='id,name,project,currentState', limit=-1):
+                if versions is None or v['id'] in versions:
+                    current[v['id']] = v
+            stats['versions'] = len(current)
+            changed = [v for vid, v in current.items() if known.get(vid) != fingerprint(v.get('currentState'))]
+            stats['changed'] = len(changed)
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = {executor.submit(self._fetch, api, v, self._revisions(v['id'])): v for v in changed}
+                for future in as_completed(futures):
+                    v = futures[future]
+                    fetched, deleted = future.result()
+                    self._store(v, fetched, deleted)
+                    stats['fetched'] += len(fetched)
+                    stats['deleted'] += len(deleted)
+                    if progress:
+                        progress(v['id'], len(fetched))
+        if versions is None:
+            with self.db:
+                for vid in set(known) - set(current):
+                    self.db.execute('DELETE FROM issues WHERE projectVersionId = ?', (vid,))
+                    self.db.execute('DELETE FROM versions WHERE id = ?', (vid,))
+        return stats
+
+    def _fetch(self, api, version, revisions):
+        """ Runs on a worker thread, so no database access here """
+        endpoint = f"/api/v1/projectVersions/{version['id']}/issues"
+        listed = {e['id']: e['revision'] for e in api.page_data(endpoint, fields='id,revision', limit=-1, **SHOW_ALL)}
+        stale = [iid for iid, rev in listed.items() if revisions.get(iid) != rev]
+        deleted = [iid for iid in revisions if iid not in listed]
+        fields = ','.join(self.COLUMNS)
+        if stale and len(stale) > len(listed) * self.refetch_ratio:
+            stale = set(stale)
+            fetched = [e for e in api.page_data(endpoint, fields=fields, limit=-1, **SHOW_ALL) if e['id'] in stale]
+        else:
+            fetched = []
+            for start in range(0, len(stale), 50):
+                fetched.extend(api.page_data(endpoint, q=Query.any_of('id', stale[start:start + 50]), fields=fields,
+                                             limit=-1, **SHOW_ALL))
+        return fetched, deleted
+
+    def _revisions(self, version_id):
+        return dict(self.db.execute('SELECT id, revision FROM issues WHERE projectVersionId = ?', (version_id,)))
+
+    def _store(self, version, fetched, deleted):
+        columns = list(self.COLUMNS)
+        placeholders = ', '.join('?' * len(columns))
+        names = ', '.join(f'"{c}"' for c in columns)
+        with self.db:
+            self.db.executemany(f'INSERT OR REPLACE INTO issues ({names}) VALUES ({placeholders})',
+                                [[version['id'] if c == 'projectVersionId' else e.get(c) for c in columns]
+                                 for e in fetched])
+            self.db.executemany('DELETE FROM issues WHERE projectVersionId = ? AND id = ?',
+                                [(version['id'], iid) for iid in deleted])
+            self.db.execute('INSERT OR REPLACE INTO versions VALUES (?, ?, ?, ?, ?)',
+                            (version['id'], version.get('project', {}).get('name'), version.get('name'),
+                             fingerprint(version.get('currentState')), time.time()))
+
+    def _where(self, conditions):
+        clauses, params = [], []
+        for column, value in conditions.items():
+            self._check(column)
+            if value is None:
+                clauses.append(f'"{column}" IS NULL')
+            elif isinstance(value, (list, tuple, set)):
+                clauses.append(f'"{column}" IN ({", ".join("?" * len(value))})')
+                params.extend(value)
+            else:
+                clauses.append(f'"{column}" = ?')
+                params.append(value)
+        return (' WHERE ' + ' AND '.join(clauses) if clauses else ''), params
+
+    def _check(self, column):
+        if column not in self.COLUMNS:
+            raise ValueError(f"Unknown column {column}, the index has {', '.join(self.COLUMNS)}")
+
+    def filter(self, order_by=None, limit=None, **conditions) -> list:
+        """
+        :param order_by: Column to sort by, prefix with `-` for descending
+        :param conditions: column=value, a list or tuple value matches any of them, None matches NULL
+        :returns: The matching issues as dicts
+        """
+        where, params = self._where(conditions)
+        sql = f'SELECT * FROM issues{where}'
+        if order_by:
+            self._check(order_by.lstrip('-'))
+            sql += f' ORDER BY "{order_by.lstrip("-")}"' + (' DESC' if order_by.startswith('-') else '')
+        if limit is not None:
+            sql += f' LIMIT {int(limit)}'
+        return [dict(r) for r in self.db.execute(sql, params)]
+
+    def count(self, **conditions) -> int:
+        where, params = self._where(conditions)
+        return self.db.execute(f'SELECT COUNT(*) FROM issues{where}', params).fetchone()[0]
+
+    def group_by(self, *columns, **conditions) -> dict:
+        """
+        :returns: The issue count per value of `columns`, keyed by the value or, for several columns, a tuple
+        """
+        assert columns, "Need at least one column to group by"
+        for c in columns:
+            self._check(c)
+        names = ', '.join(f'"{c}"' for c in columns)
+        where, params = self._where(conditions)
+        rows = self.db.execute(f'SELECT {names}, COUNT(*) FROM issues{where} GROUP BY {names}', params)
+        return {(r[0] if len(columns) == 1 else tuple(r[:-1])): r[-1] for r in rows}
@@ -0,0 +1,105 @@
+import threading
+import time
+from collections import deque
+
+
+class AdaptiveLimiter:
+    """
+    AIMD (additive increase, multiplicative decrease) cap on the requests in flight, shared by every thread using
+    the py:class:`fortifyapi.api.FortifySSCAPI` it is set on.
+
+    Every `window` healthy responses the cap grows by `increase`. It is multiplied by `decrease` when SSC answers
+    429/5xx, a request fails outright, or the p95 latency of the last window exceeds `latency_factor` times the
+    baseline p95. Requests already in flight when the cap was cut cannot cut it again, so one burst of errors
+    counts once.
+    """
+    ERROR_STATUSES = (429, 500, 502, 503, 504)
+
+    def __init__(self, initial=4, minimum=1, maximum=64, increase=1, decrease=0.5, window=20, latency_factor=2.0):
+        """
+        :param initial: The starting cap
+        :param minimum: The cap never goes below this
+        :param maximum: The cap never goes above this
+        :param increase: How much the cap grows after a healthy window
+        :param decrease: What the cap is multiplied by when backing off
+        :param window: How many responses make up a latency window
+        :param latency_factor: How far the p95 latency may exceed the baseline before backing off
+        """
+        assert minimum >= 1 and minimum <= initial <= maximum, "Need 1 <= minimum <= initial <= maximum"
+        assert 0 < decrease < 1, "decrease must be between 0 and 1"
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.window = window
+        self.latency_factor = latency_factor
+        self.baseline = None
+        self.in_flight = 0
+        self.increases = 0
+        self.decreases = 0
+        self._latencies = deque(maxlen=window)
+        self._last_cut = 0.0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> float:
+        """
+        Block until there is room under the cap
+
+        :returns: The start time to hand back to py:func:`release`
+        """
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+        return time.monotonic()
+
+    def release(self, started: float, status=None):
+        """
+        :param started: What py:func:`acquire` returned
+        :param status: The HTTP status, None if the request failed without a response
+        """
+        latency = time.monotonic() - started
+        with self._cond:
+            self.in_flight -= 1
+            if status is None or status in self.ERROR_STATUSES:
+                self._cut(started)
+            else:
+                self._latencies.append(latency)
+                if len(self._latencies) >= self.window:
+                    self._evaluate()
+            self._cond.notify_all()
+
+    def backoff(self, started=None):
+        """
+        Cut the cap, e.g. because a request is being retried after a 5xx
+        """
+        with self._cond:
+            self._cut(time.monotonic() if started is None else started)
+            self._cond.notify_all()
+
+    def _cut(self, started):
+        if started < self._last_cut:
+            return
+        self.limit = max(float(self.minimum), self.limit * self.decrease)
+        self._last_cut = time.monotonic()
+        self._latencies.clear()
+        self.decreases += 1
+
+    def _evaluate(self):
+        latencies = sorted(self._latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        self._latencies.clear()
+        if self.baseline is not None and p95 > self.baseline * self.latency_factor:
+            self._cut(time.monotonic())
+            return
+        # slow moving, so a gradual regression still shows against it
+        self.baseline = p95 if self.baseline is None else self.baseline * 0.9 + p95 * 0.1
+        if self.limit < self.maximum:
+            self.limit = min(float(self.maximum), self.limit + self.increase)
+            self.increases += 1
+
+    def stats(self) -> dict:
+        with self._cond:
+            return dict(limit=int(self.limit), in_flight=self.in_flight, baseline=self.baseline,
+                        increases=self.increases, decreases=self.decreases)
@@ -0,0 +1,111 @@
+import re
+import threading
+
+# seconds
+DEFAULT_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_ID_SEGMENT = re.compile(r'^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$')
+
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Collapse the ids in an endpoint so every call of the same API shares one series, e.g.
+    `/api/v1/projectVersions/1234/issues?start=200` becomes `/api/v1/projectVersions/{id}/issues`
+    """
+    path = endpoint.split('?', 1)[0].strip('/')
+    return '/' + '/'.join('{id}' if _ID_SEGMENT.match(e) else e for e in path.split('/'))
+
+
+class RequestMetrics:
+    """
+    Count, error count, bytes in/out and a latency histogram of every request a
+    py:class:`fortifyapi.api.FortifySSCAPI` sends, per HTTP method and endpoint template.
+    Read it with py:func:`as_dict` or render it for Prometheus with py:func:`prometheus`.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """
+        :param buckets: The latency histogram bucket upper bounds in seconds
+        """
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def record(self, method: str, endpoint: str, seconds: float, status=None, bytes_in=0, bytes_out=0):
+        """
+        :param status: The HTTP status, None when the request failed without a response. 4xx/5xx count as errors.
+        """
+        key = (method.upper(), endpoint_template(endpoint))
+        with self._lock:
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = dict(count=0, errors=0, bytes_in=0, bytes_out=0, seconds=0.0,
+                                             buckets=[0] * len(self.buckets))
+            s['count'] += 1
+            if status is None or status >= 400:
+                s['errors'] += 1
+            s['bytes_in'] += bytes_in
+            s['bytes_out'] += bytes_out
+            s['seconds'] += seconds
+            for i, le in enumerate(self.buckets):
+                if seconds <= le:
+                    s['buckets'][i] += 1
+                    break
+
+    def as_dict(self) -> dict:
+        """
+        :returns: `{(method, endpoint template): {count, errors, bytes_in, bytes_out, seconds, buckets}}` where
+                  `buckets` maps each upper bound to the cumulative count, like Prometheus
+        """
+        with self._lock:
+            ret = {}
+            for key, s in self._series.items():
+                cumulative, total = {}, 0
+                for le, n in zip(self.buckets, s['buckets']):
+                    total += n
+                    cumulative[le] = total
+                ret[key] = {**s, 'buckets': cumulative}
+            return ret
+
+    def reset(self):
+        with self._lock:
+            self._series.clear()
+
+    def prometheus(self, prefix='fortifyapi') -> str:
+        """
+        :returns: The metrics in the Prometheus text exposition format
+        """
+        data = self.as_dict()
+        lines = []
+
+        def family(name, typ, help, values):
+            lines.append(f"# HELP {prefix}_{name} {help}")
+            lines.append(f"# TYPE {prefix}_{name} {typ}")
+            lines.extend(values)
+
+        def labels(key, **extra):
+            method, endpoint = key
+            pairs = dict(method=method, endpoint=endpoint, **extra)
+            return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs.items()) + '}'
+
+        family('requests_total', 'counter', 'Requests sent to SSC',
+               [f"{prefix}_requests_total{labels(k)} {s['count']}" for k, s in data.items()])
+        family('request_errors_total', 'counter', 'Requests that failed or returned 4xx/5xx',
+               [f"{prefix}_request_errors_total{labels(k)} {s['errors']}" for k, s in data.items()])
+        family('response_bytes_total', 'counter', 'Bytes received from SSC',
+               [f"{prefix}_response_bytes_total{labels(k)} {s['bytes_in']}" for k, s in data.items()])
+        family('request_bytes_total', 'counter', 'Bytes sent to SSC',
+               [f"{prefix}_request_bytes_total{labels(k)} {s['bytes_out']}" for k, s in data.items()])
+        histogram = []
+        for k, s in data.items():
+            for le, n in s['buckets'].items():
+                histogram.append(f"{prefix}_request_duration_seconds_bucket{labels(k, le=le)} {n}")
+            histogram.append(f"{prefix}_request_duration_seconds_bucket{labels(k, le='+Inf')} {s['count']}")
+            histogram.append(f"{prefix}_request_duration_seconds_sum{labels(k)} {s['seconds']}")
+            histogram.append(f"{prefix}_request_duration_seconds_count{labels(k)} {s['count']}")
+        family('request_duration_seconds', 'histogram', 'Time until SSC responded', histogram)
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,117 @@
+import copy
+import threading
+import time
+
+
+class NameIndex:
+    """
+    (project name, version name) to version lookups without asking SSC, used by
+    py:class:`fortifyapi.api.FortifySSCAPI` when given as its `names`.
+
+    The index is warmed by one listing of every version, with only the fields in `FIELDS`, the first time it is
+    used and again once it is `max_age` seconds old. After that the client keeps it current with its own creates
+    and deletes. Versions created or deleted by someone else are not seen until the next warm-up, so a miss only
+    means "ask SSC", and a hit may name a version another client has deleted since.
+    """
+    FIELDS = ('id', 'name', 'project', 'active', 'committed')
+
+    def __init__(self, max_age=None):
+        """
+        :param max_age: Seconds after which the next lookup lists every version again, None to never do so
+        """
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.warmups = 0
+        self._versions = {}
+        self._projects = {}
+        # version id to its key in _versions, and how many versions each project has, so removal is O(1)
+        self._keys = {}
+        self._counts = {}
+        self._warmed = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._versions)
+
+    def _stale(self):
+        return self._warmed is None or (self.max_age is not None and time.monotonic() - self._warmed > self.max_age)
+
+    def warm(self, api, force=False):
+        """
+        List every version into the index, unless it is already warm and not older than `max_age`
+
+        :param api: py:class:`fortifyapi.api.FortifySSCAPI`
+        """
+        if not force and not self._stale():
+            return
+        versions, projects, keys, counts = {}, {}, {}, {}
+        with api:
+            for e in api.page_data('/api/v1/projectVersions', fields=','.join(self.FIELDS), limit=-1):
+                key = (e['project']['name'], e['name'])
+                if key not in versions:
+                    counts[key[0]] = counts.get(key[0], 0) + 1
+                versions[key] = e
+                keys[e['id']] = key
+                projects[key[0]] = e['project']
+        with self._lock:
+            self._versions, self._projects, self._keys, self._counts = versions, projects, keys, counts
+            self._warmed = time.monotonic()
+            self.warmups += 1
+
+    def version(self, project_name, version_name):
+        """
+        :returns: The version's listing, with only the fields in `FIELDS`, or None if it is not known
+        """
+        with self._lock:
+            e = self._versions.get((project_name, version_name))
+            if e is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return copy.deepcopy(e)
+
+    def project(self, project_name):
+        """
+        :returns: The project as embedded in its versions' listings, or None if it is not known
+        """
+        with self._lock:
+            p = self._projects.get(project_name)
+            return copy.deepcopy(p) if p is not None else None
+
+    def add(self, version):
+        """ Record a version created or found by this client, it needs at least `id`, `name` and `project` """
+        e = {k: version[k] for k in self.FIELDS if k in version}
+        key = (e['project']['name'], e['name'])
+        with self._lock:
+            if self._keys.get(e['id'], key) != key:
+                self._remove(e['id'])
+            previous = self._versions.get(key)
+            if previous is None:
+                self._counts[key[0]] = self._counts.get(key[0], 0) + 1
+            elif previous['id'] != e['id']:
+                self._keys.pop(previous['id'], None)
+            self._versions[key] = e
+            self._keys[e['id']] = key
+            self._projects[key[0]] = e['project']
+
+    def remove(self, version_id):
+        """ Forget a version deleted by this client, and its project along with the project's last version """
+        with self._lock:
+            self._remove(version_id)
+
+    def _remove(self, version_id):
+        key = self._keys.pop(version_id, None)
+        if key is None:
+            return
+        del self._versions[key]
+        self._counts[key[0]] -= 1
+        if not self._counts[key[0]]:
+            del self._counts[key[0]]
+            self._projects.pop(key[0], None)
+
+    def clear(self):
+        """ Forget everything, the next lookup warms the index again """
+        with self._lock:
+            self._versions, self._projects, self._keys, self._counts = {}, {}, {}, {}
+            self._warmed = None
@@ -1,3 +1,7 @@
+# SSC leaves suppressed, hidden and removed issues out of issue listings unless asked for them
+SHOW_ALL = dict(showsuppressed=True, showhidden=True, showremoved=True)
+
+
 class Condition:
     def __init__(self, typ, name, value):
         self.typ = typ
@@ -51,6 +55,19 @@ class Query:
             for k, v in query_obj.items():
                 self.query(k, v)
 
+    @classmethod
+    def any_of(cls, name, values):
+        """
+        ?q=key:"value1"+or+key:"value2"+or+key:"value3"
+        q=Query.any_of('key', ['value1', 'value2', 'value3'])
+        """
+        values = list(values)
+        assert values, "Need at least one value"
+        q = cls().query(name, values[0])
+        for value in values[1:]:
+            q.or_query(name, value)
+        return q
+
     def query(self, name, value):
         self.__queries.append(AddCondition(name, value))
         return self
@@ -0,0 +1,80 @@
+"""
+Compact alternatives to SSCObject for high volume listings, e.g. `version.issues.list(records=True)` or
+`version.issues.list(columns=10000)`. Records hold only the requested fields, no api or parent reference.
+"""
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+
+# stop sharing the values of a field once it has this many distinct ones, e.g. ids
+_MAX_SHARED = 1024
+
+
+@lru_cache(maxsize=None)
+def record_type(name: str, fields: tuple):
+    """
+    A namedtuple type for `fields`, every listing of the same shape shares it. Fields that are not valid identifiers,
+    e.g. `_href`, are renamed to their position, `_1`.
+    """
+    return namedtuple(name, fields, rename=True)
+
+
+class _Shared:
+    """ Make equal values of low cardinality fields, e.g. `friority`, one object instead of one per row """
+
+    def __init__(self, fields):
+        self._values = [{} for _ in fields]
+
+    def __call__(self, i, value):
+        values = self._values[i]
+        if values is None or not isinstance(value, str):
+            return value
+        shared = values.setdefault(value, value)
+        if len(values) > _MAX_SHARED:
+            self._values[i] = None
+        return shared
+
+
+def to_records(rows, name: str, fields):
+    """
+    :param rows: The dicts SSC returned
+    :param fields: The fields to keep, missing ones are None
+    :returns: A generator of `record_type(name, fields)` tuples
+    """
+    fields = tuple(fields)
+    make = record_type(name, fields)._make
+    shared = _Shared(fields)
+    for row in rows:
+        yield make([shared(i, row.get(f)) for i, f in enumerate(fields)])
+
+
+def to_columns(rows, fields, size=10000):
+    """
+    :param rows: The dicts SSC returned
+    :param fields: The fields to keep, missing ones are None
+    :param size: The most rows per batch
+    :returns: A generator of `{field: column}` dicts. Integer and float columns are `array.array`, others lists.
+    """
+    fields = tuple(fields)
+    shared = _Shared(fields)
+    batch = [[] for _ in fields]
+    for row in rows:
+        for i, f in enumerate(fields):
+            batch[i].append(shared(i, row.get(f)))
+        if len(batch[0]) >= size:
+            yield {f: _column(values) for f, values in zip(fields, batch)}
+            batch = [[] for _ in fields]
+    if batch[0]:
+        yield {f: _column(values) for f, values in zip(fields, batch)}
+
+
+def _column(values):
+    types = set(map(type, values))
+    try:
+        if types == {int}:
+            return array('q', values)
+        if types and types <= {int, float}:
+            return array('d', values)
+    except OverflowError:
+        pass
+    return values
@@ -0,0 +1,86 @@
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+class SummaryTable(dict):
+    """
+    The issue summaries of many versions, `{version id: {'project', 'version', 'state', 'summary'}}`, as built by
+    py:func:`fortifyapi.client.FortifySSCClient.issue_summaries`. `state` fingerprints the version's
+    `currentState` when the summary was read, entries whose request failed have an `error` instead.
+    """
+
+    def counts(self, field='totalCount') -> dict:
+        """
+        :param field: The value to take from each group of a summary
+        :returns: `{(version id, group name): value}`
+        """
+        return {(vid, group['name']): group.get(field, 0)
+                for vid, entry in self.items() for group in entry.get('summary') or []}
+
+    def totals(self, field='totalCount') -> dict:
+        """
+        :returns: `{group name: value}` summed over every version
+        """
+        totals = {}
+        for (_, name), value in self.counts(field).items():
+            totals[name] = totals.get(name, 0) + (value or 0)
+        return totals
+
+    def errors(self) -> dict:
+        return {vid: entry['error'] for vid, entry in self.items() if 'error' in entry}
+
+    def save(self, path):
+        with open(path, 'w') as f:
+            json.dump(self, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            # json keys are strings
+            return cls({int(vid): entry for vid, entry in json.load(f).items()})
+
+
+def fingerprint(state) -> str:
+    """ A digest of a version's `currentState`, it changes when the version's issues may have """
+    return hashlib.sha1(json.dumps(state, sort_keys=True).encode()).hexdigest()
+
+
+def collect(client, previous=None, workers=8, progress=None, **params) -> SummaryTable:
+    """
+    See py:func:`fortifyapi.client.FortifySSCClient.issue_summaries`
+    """
+    previous = previous or {}
+    table = SummaryTable()
+    stale = []
+    # Version.get is not dict.get
+    for v in client.list_all_project_versions(fields='id,name,project,currentState'):
+        entry = previous.get(v['id'])
+        state = fingerprint(v['currentState'])
+        if entry is not None and entry.get('state') == state and 'error' not in entry:
+            table[v['id']] = entry
+        else:
+            stale.append((v, state))
+
+    def fetch(version_id):
+        with client.api as api:
+            return api.get(f"/api/v1/projectVersions/{version_id}/issueSummaries", **params)['data']
+
+    done, total = len(table), len(table) + len(stale)
+    if progress:
+        progress(done, total)
+    with client.api:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {executor.submit(fetch, v['id']): (v, state) for v, state in stale}
+            for future in as_completed(futures):
+                v, state = futures[future]
+                entry = dict(project=v['project']['name'], version=v['name'])
+                try:
+                    entry.update(state=state, summary=future.result())
+                except Exception as e:
+                    entry['error'] = str(e)
+                table[v['id']] = entry
+                done += 1
+                if progress:
+                    progress(done, total)
+    return table
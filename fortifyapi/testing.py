@@ -0,0 +1,737 @@
+"""
+An in-process stand-in for SSC, for tests and benchmarks that cannot use a live server, e.g.
+
+    with FakeSSC(latency=0.01) as ssc:
+        version = ssc.add_version('project', 'version', issues=5000)
+        client = FortifySSCClient(ssc.url, ssc.token)
+        issues = list(client.versions.get(version['id']).issues.list())
+
+It covers the endpoints this package uses: tokens, projects, project versions, issues (with audit/suppress and
+revision checks), issue summaries, artifacts (upload, processing and download with HTTP Range), file tokens,
+cloud jobs, the bulk API and a few reference data collections. Collections support start/limit/count paging,
+`q`, `fields` and `orderby`, issue listings `showsuppressed`, `showhidden` and `showremoved`. Latency and failures
+can be injected. py:class:`FakeSSCTestCase` runs each test against a fresh one.
+"""
+import base64
+import copy
+import fnmatch
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from unittest import TestCase
+from urllib.parse import urlsplit, parse_qsl
+
+__all__ = ['FakeSSC', 'FakeSSCTestCase', 'fake_timestamp']
+
+_ANALYSIS = ['Not an Issue', 'Reliability Issue', 'Bad Practice', 'Suspicious', 'Exploitable']
+_FRIORITIES = ['Critical', 'High', 'Medium', 'Low']
+_TERMINAL_JOB_STATES = ('UPLOAD_COMPLETED', 'UPLOAD_FAILED', 'UPLOAD_CANCELED', 'SCAN_FAILED', 'SCAN_FAULTED',
+                        'SCAN_TIMEOUT', 'SCAN_CANCELED', 'INVALID')
+_QUERY_TERM = re.compile(r'(?P<sep>^|,|\+and\+|\+or\+)(?P<field>[\w.]+):(?P<value>"[^"]*"|[^,+]*)')
+
+
+def fake_timestamp(when=None) -> str:
+    """ A timestamp in the format SSC uses, e.g. `2023-01-31T13:37:00.000+0000` """
+    when = when or datetime.now(timezone.utc)
+    return when.strftime('%Y-%m-%dT%H:%M:%S.') + f"{when.microsecond // 1000:03d}+0000"
+
+
+class _Response(Exception):
+    """ Raised by a route to answer with a non 2xx status """
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class FakeSSC:
+
+    def __init__(self, latency=0.0, failure_rate=0.0, failure_status=503, processing_time=0.0, seed=0,
+                 users=None, token='fake-token'):
+        """
+        :param latency: Seconds every request sleeps before being answered
+        :param failure_rate: Fraction of (non token) requests answered with `failure_status`
+        :param failure_status: The status injected failures use
+        :param processing_time: Seconds an uploaded artifact stays in PROCESSING
+        :param seed: Seed for the failure injection and generated data
+        :param users: dict of username to password that may create tokens, defaults to admin/admin
+        :param token: A token that is valid from the start
+        """
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.processing_time = processing_time
+        self.users = users if users is not None else {'admin': 'admin'}
+        self.token = token
+        self.tokens = {token}
+        self.requests = []
+        self.random = random.Random(seed)
+        self.projects = {}
+        self.versions = {}
+        self.issues = {}
+        self.artifacts = {}
+        self.files = {}
+        self.cloudjobs = {}
+        self.file_tokens = set()
+        self.reference = {
+            'engineTypes': [{'id': n, 'name': n} for n in ('SCA', 'WEBINSPECT', 'SONATYPE')],
+            'coreRulepacks': [{'id': 1, 'name': 'Fortify Secure Coding Rules, Core', 'version': '2023.1.0.0001'}],
+            'bugtrackers': [{'id': 'jira', 'displayLabel': 'JIRA'}],
+            'cloudpools': [{'uuid': '00000000-0000-0000-0000-000000000002', 'name': 'Default Pool'}],
+            'attributeDefinitions': [{'id': n, 'name': f"Attribute {n}"} for n in (1, 5, 6, 7)],
+            'issueTemplates': [{'id': 'Prioritized-HighRisk-Project-Template', 'name': 'Prioritized High Risk'}],
+        }
+        self._ids = 0
+        self._fail_next = []
+        self._interrupt_downloads = 0
+        self._lock = threading.RLock()
+        self._server = None
+        self._thread = None
+
+    # server lifecycle
+
+    def start(self):
+        fake = self
+
+        class Handler(_Handler):
+            ssc = fake
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, type, value, traceback):
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        assert self._server is not None, "FakeSSC is not started"
+        return f"http://127.0.0.1:{self._server.server_address[1]}/ssc"
+
+    # failure injection
+
+    def fail_next(self, count=1, status=503, path=None):
+        """ Answer the next `count` (non token) requests with `status`, only those matching `path` (a glob) if given """
+        with self._lock:
+            self._fail_next.extend([(status, path)] * count)
+
+    def interrupt_downloads(self, count=1):
+        """ Drop the connection halfway through the next `count` downloads """
+        with self._lock:
+            self._interrupt_downloads += count
+
+    def request_count(self, method=None, path=None) -> int:
+        """ How many requests were received, optionally only those matching `method` and `path` (a glob) """
+        return sum(1 for m, p in list(self.requests)
+                   if (method is None or m == method) and (path is None or fnmatch.fnmatchcase(p, path)))
+
+    # data setup
+
+    def _next_id(self):
+        with self._lock:
+            self._ids += 1
+            return self._ids
+
+    def add_project(self, name, description=''):
+        with self._lock:
+            for p in self.projects.values():
+                if p['name'] == name:
+                    raise _Response(409, f"Application {name} already exists")
+            pid = self._next_id()
+            self.projects[pid] = {
+                'id': pid,
+                'name': name,
+                'description': description,
+                'issueTemplateId': 'Prioritized-HighRisk-Project-Template',
+                'createdBy': 'admin',
+                'creationDate': fake_timestamp(),
+                '_href': f"/api/v1/projects/{pid}",
+            }
+            return self.projects[pid]
+
+    def add_version(self, project_name, name, issues=0, committed=True, created=None, last_upload=None, **extra):
+        """
+        Add a version, creating the project if needed
+
+        :param issues: How many issues to generate for it
+        :param created: The creation datetime, defaults to now
+        :param last_upload: The datetime of its last FPR upload, None if never
+        :returns: The version
+        """
+        with self._lock:
+            project = next((p for p in self.projects.values() if p['name'] == project_name), None)
+            if project is None:
+                project = self.add_project(project_name)
+            for v in self.versions.values():
+                if v['project']['id'] == project['id'] and v['name'] == name:
+                    raise _Response(409, f"Version {name} already exists")
+            vid = self._next_id()
+            self.versions[vid] = {
+                'id': vid,
+                'name': name,
+                'description': extra.pop('description', ''),
+                'active': extra.pop('active', True),
+                'committed': committed,
+                'issueTemplateId': project['issueTemplateId'],
+                'creationDate': fake_timestamp(created),
+                'createdBy': 'admin',
+                'bugTrackerEnabled': False,
+                'dataRetentionPolicyOverride': False,
+                'project': {k: project[k] for k in ('id', 'name', 'description', 'issueTemplateId')},
+                'currentState': {
+                    'id': vid,
+                    'lastFprUploadDate': fake_timestamp(last_upload) if last_upload else None,
+                    'analysisResultsExist': issues > 0,
+                    'issueCountDelta': 0,
+                },
+                '_href': f"/api/v1/projectVersions/{vid}",
+                **extra
+            }
+            self.issues[vid] = {}
+            self.add_issues(vid, issues)
+            return self.versions[vid]
+
+    def add_issues(self, version_id, count, **fields):
+        """ Generate `count` issues for the version """
+        with self._lock:
+            issues = self.issues[version_id]
+            for _ in range(count):
+                iid = self._next_id()
+                issues[iid] = {
+                    'id': iid,
+                    'revision': 0,
+                    'issueInstanceId': f"{self.random.getrandbits(128):032X}",
+                    'friority': self.random.choice(_FRIORITIES),
+                    'primaryTag': None,
+                    'folderGuid': 'bb824e8d-b401-40be-13bd-5d156696a685',
+                    'issueName': self.random.choice(['SQL Injection', 'Cross-Site Scripting: Reflected',
+                                                     'Path Manipulation', 'Password Management']),
+                    'primaryLocation': f"File{self.random.randint(1, 500)}.java",
+                    'fullFileName': f"src/main/java/com/example/File{self.random.randint(1, 500)}.java",
+                    'lineNumber': self.random.randint(1, 2000),
+                    'kingdom': 'Input Validation and Representation',
+                    'severity': float(self.random.randint(1, 5)),
+                    'likelihood': round(self.random.random() * 5, 2),
+                    'impact': round(self.random.random() * 5, 2),
+                    'confidence': 5.0,
+                    'engineType': 'SCA',
+                    'analyzer': 'Dataflow',
+                    'projectVersionId': version_id,
+                    'projectName': self.versions[version_id]['project']['name'],
+                    'projectVersionName': self.versions[version_id]['name'],
+                    'suppressed': False,
+                    'removed': False,
+                    'hidden': False,
+                    'audited': False,
+                    'reviewed': None,
+                    'foundDate': fake_timestamp(),
+                    'removedDate': None,
+                    '_href': f"/api/v1/issues/{iid}",
+                    **fields
+                }
+
+    def add_cloudjob(self, state='PENDING', version_id=None, queued=None, **extra):
+        with self._lock:
+            token = str(uuid.UUID(int=self.random.getrandbits(128)))
+            version = self.versions.get(version_id, {})
+            self.cloudjobs[token] = {
+                'jobToken': token,
+                'jobState': state,
+                'jobCancellable': state not in _TERMINAL_JOB_STATES,
+                'jobQueuedTime': fake_timestamp(queued),
+                'jobStartedTime': None,
+                'jobFinishedTime': fake_timestamp() if state in _TERMINAL_JOB_STATES else None,
+                'priority': 0,
+                'pvId': version.get('id'),
+                'pvName': version.get('name'),
+                'projectId': version.get('project', {}).get('id'),
+                'projectName': version.get('project', {}).get('name'),
+                'scaVersion': '23.1.0.0001',
+                'submitterUserName': 'admin',
+                '_href': f"/api/v1/cloudjobs/{token}",
+                **extra
+            }
+            return self.cloudjobs[token]
+
+    def set_job_state(self, token, state):
+        with self._lock:
+            job = self.cloudjobs[token]
+            job['jobState'] = state
+            job['jobCancellable'] = state not in _TERMINAL_JOB_STATES
+            if state == 'SCAN_RUNNING' and job['jobStartedTime'] is None:
+                job['jobStartedTime'] = fake_timestamp()
+            if state in _TERMINAL_JOB_STATES:
+                job['jobFinishedTime'] = fake_timestamp()
+
+    # request handling
+
+    def handle(self, method, path, query, body, headers):
+        """
+        :returns: (status, json data or bytes, extra headers)
+        """
+        with self._lock:
+            self.requests.append((method, path))
+        if self.latency:
+            time.sleep(self.latency)
+        if not path.startswith('/ssc/'):
+            return 404, {'message': 'Not found', 'responseCode': 404}, {}
+        path = path[len('/ssc'):]
+
+        if path == '/api/v1/tokens' and method == 'POST':
+            return self._create_token(body, headers)
+        if path == '/api/v1/tokens/action/revoke' and method == 'POST':
+            return self._revoke_tokens(body, headers)
+
+        with self._lock:
+            injected = None
+            for i, (status, pattern) in enumerate(self._fail_next):
+                if pattern is None or fnmatch.fnmatchcase(path, pattern):
+                    injected = self._fail_next.pop(i)[0]
+                    break
+        if injected is None and self.failure_rate and self.random.random() < self.failure_rate:
+            injected = self.failure_status
+        if injected is not None:
+            return injected, {'message': 'Injected failure', 'responseCode': injected}, {}
+
+        if path.startswith('/download/'):
+            return self._download(path, query, headers)
+        if not self._authorized(headers.get('Authorization', '')):
+            return 401, {'message': 'Access Denied', 'responseCode': 401}, {}
+        return self._route(method, path, query, body)
+
+    def _authorized(self, auth):
+        if auth.startswith('FortifyToken '):
+            return auth[len('FortifyToken '):] in self.tokens
+        if auth.startswith('Basic '):
+            user, _, password = base64.b64decode(auth[6:]).decode().partition(':')
+            return self.users.get(user) == password
+        return False
+
+    def _route(self, method, path, query, body):
+        for m, pattern, route in _ROUTES:
+            if m == method:
+                match = pattern.fullmatch(path)
+                if match:
+                    try:
+                        with self._lock:
+                            status, data = route(self, query, body, *match.groups())
+                    except _Response as e:
+                        return e.status, {'message': str(e), 'responseCode': e.status}, {}
+                    if isinstance(data, dict):
+                        data.setdefault('responseCode', status)
+                    return status, data, {}
+        return 404, {'message': f"No route for {method} {path}", 'responseCode': 404}, {}
+
+    def _create_token(self, body, headers):
+        auth = headers.get('Authorization', '')
+        if auth.startswith('Basic ') and self._authorized(auth):
+            token = uuid.uuid4().hex
+            with self._lock:
+                self.tokens.add(token)
+            return 201, {'data': {'token': token, 'type': (body or {}).get('type')}, 'responseCode': 201}, {}
+        return 401, {'message': 'Access Denied', 'responseCode': 401}, {}
+
+    def _revoke_tokens(self, body, headers):
+        with self._lock:
+            for token in (body or {}).get('tokens', []):
+                self.tokens.discard(token)
+        return 200, {'data': {'message': 'revoked'}, 'responseCode': 200}, {}
+
+    def _download(self, path, query, headers):
+        if query.get('mat') not in self.file_tokens:
+            return 403, {'message': 'Invalid file token', 'responseCode': 403}, {}
+        oid = int(query.get('id', 0))
+        if path == '/download/artifactDownload.html':
+            content = self.files.get(('artifact', oid))
+        else:
+            content = self.files.get(('version', oid))
+            if content is None and oid in self.versions:
+                content = _fpr_bytes(oid, 1 << 20)
+        if content is None:
+            return 404, {'message': 'Not found', 'responseCode': 404}, {}
+        extra = {'Content-Disposition': f'attachment; filename="{oid}.fpr"', 'Accept-Ranges': 'bytes'}
+        status = 200
+        match = re.fullmatch(r'bytes=(\d+)-', headers.get('Range', ''))
+        if match and int(match.group(1)) < len(content):
+            start = int(match.group(1))
+            extra['Content-Range'] = f"bytes {start}-{len(content) - 1}/{len(content)}"
+            content = content[start:]
+            status = 206
+        with self._lock:
+            if self._interrupt_downloads:
+                self._interrupt_downloads -= 1
+                extra['X-Fake-Interrupt'] = str(len(content) // 2)
+        return status, content, extra
+
+    # helpers for the routes
+
+    @staticmethod
+    def _matches(obj, q):
+        if not q:
+            return True
+        groups, current = [], []
+        for m in _QUERY_TERM.finditer(q):
+            if m.group('sep') == '+or+':
+                groups.append(current)
+                current = []
+            current.append((m.group('field'), m.group('value').strip('"')))
+        groups.append(current)
+
+        def test(field, pattern):
+            value = obj
+            for part in field.split('.'):
+                value = value.get(part) if isinstance(value, dict) else None
+            value = 'true' if value is True else 'false' if value is False else value
+            return fnmatch.fnmatchcase(str(value).lower(), pattern.lower())
+
+        return any(all(test(f, p) for f, p in group) for group in groups if group)
+
+    @staticmethod
+    def _page(items, query):
+        items = [i for i in items if FakeSSC._matches(i, query.get('q'))]
+        orderby = query.get('orderby')
+        if orderby:
+            for key in reversed(orderby.split(',')):
+                desc = key.startswith('-')
+                key = key.lstrip('-+')
+                items.sort(key=lambda i: (i.get(key) is None, i.get(key) if i.get(key) is not None else ''),
+                           reverse=desc)
+        start = int(query.get('start', 0))
+        limit = int(query.get('limit', 200))
+        page = items[start:] if limit == -1 else items[start:start + limit]
+        fields = query.get('fields')
+        if fields:
+            fields = fields.split(',')
+            page = [{k: i[k] for k in fields if k in i} for i in page]
+        else:
+            page = copy.deepcopy(page)
+        return 200, {'data': page, 'count': len(items)}
+
+    def _version(self, vid):
+        version = self.versions.get(int(vid))
+        if version is None:
+            raise _Response(404, f"Project version {vid} not found")
+        return version
+
+    def _advance_artifacts(self):
+        now = time.time()
+        for a in self.artifacts.values():
+            if a['status'] == 'PROCESSING' and now - a['_uploaded'] >= self.processing_time:
+                a['status'] = 'PROCESS_COMPLETE'
+                state = self.versions[a['_version']]['currentState']
+                state['lastFprUploadDate'] = a['uploadDate']
+                state['analysisResultsExist'] = True
+
+    @staticmethod
+    def _artifact(a):
+        return {k: v for k, v in a.items() if not k.startswith('_')}
+
+    # routes, (query, body, *path groups) -> (status, response)
+
+    def _projects(self, query, body):
+        return self._page(list(self.projects.values()), query)
+
+    def _project(self, query, body, pid):
+        if int(pid) not in self.projects:
+            raise _Response(404, f"Application {pid} not found")
+        return 200, {'data': copy.deepcopy(self.projects[int(pid)])}
+
+    def _project_test(self, query, body):
+        name = body.get('applicationName')
+        return 200, {'data': {'found': any(p['name'] == name for p in self.projects.values())}}
+
+    def _project_versions(self, query, body, pid):
+        return self._page([v for v in self.versions.values() if v['project']['id'] == int(pid)], query)
+
+    def _all_versions(self, query, body):
+        return self._page(list(self.versions.values()), query)
+
+    def _get_version(self, query, body, vid):
+        return 200, {'data': copy.deepcopy(self._version(vid))}
+
+    def _create_version(self, query, body):
+        project = body.get('project') or {}
+        if project.get('id') is None:
+            self.add_project(project.get('name'), project.get('description', ''))
+        elif int(project['id']) not in self.projects:
+            raise _Response(404, f"Application {project['id']} not found")
+        project_name = project.get('name') or self.projects[int(project['id'])]['name']
+        version = self.add_version(project_name, body['name'], committed=body.get('committed', False),
+                                   description=body.get('description', ''), active=body.get('active', True))
+        return 201, {'data': copy.deepcopy(version)}
+
+    def _update_version(self, query, body, vid):
+        version = self._version(vid)
+        version.update({k: v for k, v in body.items() if k not in ('id', 'project', 'currentState')})
+        return 200, {'data': copy.deepcopy(version)}
+
+    def _delete_version(self, query, body, vid):
+        version = self._version(vid)
+        del self.versions[version['id']]
+        self.issues.pop(version['id'], None)
+        # the project goes with its last version
+        if not any(v['project']['id'] == version['project']['id'] for v in self.versions.values()):
+            self.projects.pop(version['project']['id'], None)
+        return 200, {}
+
+    def _version_test(self, query, body):
+        found = any(v['name'] == body.get('projectVersionName') and v['project']['name'] == body.get('projectName')
+                    for v in self.versions.values())
+        return 200, {'data': {'found': found}}
+
+    def _version_accepted(self, query, body, vid, *_):
+        self._version(vid)
+        return 200, {'data': body}
+
+    def _get_bugtracker(self, query, body, vid):
+        version = self._version(vid)
+        return 200, {'data': [{'bugTracker': version.get('_bugtracker')}]}
+
+    def _set_bugtracker(self, query, body, vid):
+        version = self._version(vid)
+        version['_bugtracker'] = body[0] if body else None
+        return 200, {'data': [{'bugTracker': version['_bugtracker']}]}
+
+    def _issues(self, query, body, vid):
+        self._version(vid)
+        # like SSC, suppressed, hidden and removed issues are only listed when asked for
+        shown = [i for i in self.issues[int(vid)].values()
+                 if all(str(query.get(f"show{flag}")).lower() == 'true' or not i.get(flag)
+                        for flag in ('suppressed', 'hidden', 'removed'))]
+        return self._page(shown, query)
+
+    def _issue(self, query, body, vid, iid):
+        issue = self.issues.get(int(vid), {}).get(int(iid))
+        if issue is None:
+            raise _Response(404, f"Issue {iid} not found")
+        return 200, {'data': copy.deepcopy(issue)}
+
+    def _issue_action(self, query, body, vid, action):
+        issues = self.issues.get(self._version(vid)['id'])
+        refs = body.get('issues', [])
+        for ref in refs:
+            if ref['id'] not in issues:
+                raise _Response(404, f"Issue {ref['id']} not found")
+        stale = [ref['id'] for ref in refs if ref.get('revision') != issues[ref['id']]['revision']]
+        if stale:
+            raise _Response(409, f"Issue revision mismatch, the issues {stale} were changed by someone else")
+        self.versions[int(vid)]['currentState']['metricEvaluationDate'] = fake_timestamp()
+        for ref in refs:
+            issue = issues[ref['id']]
+            issue['revision'] += 1
+            if 'suppressed' in body:
+                issue['suppressed'] = body['suppressed']
+            for tag in body.get('customTagAudit', []) if action == 'audit' else []:
+                if tag.get('customTagGuid') == '87f2364f-dcd4-49e6-861d-f8d3f351686b':
+                    index = tag.get('newCustomTagIndex')
+                    issue['primaryTag'] = _ANALYSIS[index] if index is not None and index >= 0 else None
+                    issue['audited'] = True
+        return 200, {'data': {'message': f"{len(refs)} issues updated"}}
+
+    def _issue_summaries(self, query, body, vid):
+        counts = {}
+        for issue in self.issues[self._version(vid)['id']].values():
+            counts[issue['friority']] = counts.get(issue['friority'], 0) + 1
+        return 200, {'data': [{'name': f, 'totalCount': counts.get(f, 0)} for f in _FRIORITIES]}
+
+    def _version_artifacts(self, query, body, vid):
+        self._version(vid)
+        self._advance_artifacts()
+        items = [self._artifact(a) for a in self.artifacts.values() if a['_version'] == int(vid)]
+        return self._page(items, query)
+
+    def _upload_artifact(self, query, body, vid):
+        version = self._version(vid)
+        name, content = body
+        aid = self._next_id()
+        self.artifacts[aid] = {
+            'id': aid,
+            'originalFileName': name,
+            'fileSize': len(content),
+            'status': 'PROCESSING',
+            'uploadDate': fake_timestamp(),
+            'lastScanDate': fake_timestamp(),
+            'engineType': query.get('engineType'),
+            '_version': version['id'],
+            '_uploaded': time.time(),
+        }
+        self.files[('artifact', aid)] = content
+        self.files[('version', version['id'])] = content
+        self._advance_artifacts()
+        return 201, {'data': self._artifact(self.artifacts[aid])}
+
+    def _get_artifact(self, query, body, aid):
+        self._advance_artifacts()
+        if int(aid) not in self.artifacts:
+            raise _Response(404, f"Artifact {aid} not found")
+        return 200, {'data': self._artifact(self.artifacts[int(aid)])}
+
+    def _file_token(self, query, body):
+        token = uuid.uuid4().hex
+        self.file_tokens.add(token)
+        return 201, {'data': {'token': token, 'fileTokenType': body.get('fileTokenType')}}
+
+    def _cloudjobs(self, query, body):
+        return self._page(list(self.cloudjobs.values()), query)
+
+    def _cloudjob(self, query, body, token):
+        if token not in self.cloudjobs:
+            raise _Response(404, f"Job {token} not found")
+        return 200, {'data': copy.deepcopy(self.cloudjobs[token])}
+
+    def _cancel_cloudjobs(self, query, body):
+        tokens = body.get('jobTokens', [])
+        unknown = [t for t in tokens if t not in self.cloudjobs]
+        if unknown:
+            raise _Response(400, f"Unknown job tokens {unknown}")
+        for token in tokens:
+            if self.cloudjobs[token]['jobCancellable']:
+                self.set_job_state(token, 'SCAN_CANCELED')
+        return 200, {'data': {'status': 'success'}}
+
+    def _reference(self, query, body, name):
+        return self._page(self.reference[name], query)
+
+    def _bulk(self, query, body):
+        responses = []
+        base = self.url
+        for req in body.get('requests', []):
+            parts = urlsplit(req['uri'][len(base):] if req['uri'].startswith(base) else req['uri'])
+            sub_query = dict(parse_qsl(parts.query))
+            verb = req.get('httpVerb', 'GET').upper()
+            status, data, _ = self._route(verb, parts.path, sub_query, req.get('postData'))
+            responses.append({'request': req, 'responses': [{'request': req, 'body': data}]})
+        return 200, {'data': responses}
+
+
+_ROUTES = [(m, re.compile(p), f) for m, p, f in [
+    ('GET', r'/api/v1/projects', FakeSSC._projects),
+    ('GET', r'/api/v1/projects/(\d+)', FakeSSC._project),
+    ('POST', r'/api/v1/projects/action/test', FakeSSC._project_test),
+    ('GET', r'/api/v1/projects/(\d+)/versions', FakeSSC._project_versions),
+    ('GET', r'/api/v1/projectVersions', FakeSSC._all_versions),
+    ('POST', r'/api/v1/projectVersions', FakeSSC._create_version),
+    ('POST', r'/api/v1/projectVersions/action/test', FakeSSC._version_test),
+    ('GET', r'/api/v1/projectVersions/(\d+)', FakeSSC._get_version),
+    ('PUT', r'/api/v1/projectVersions/(\d+)', FakeSSC._update_version),
+    ('DELETE', r'/api/v1/projectVersions/(\d+)', FakeSSC._delete_version),
+    ('PUT', r'/api/v1/projectVersions/(\d+)/(attributes|responsibilities|resultProcessingRules)',
+     FakeSSC._version_accepted),
+    ('POST', r'/api/v1/projectVersions/(\d+)/(action)', FakeSSC._version_accepted),
+    ('GET', r'/api/v1/projectVersions/(\d+)/bugtracker', FakeSSC._get_bugtracker),
+    ('PUT', r'/api/v1/projectVersions/(\d+)/bugtracker', FakeSSC._set_bugtracker),
+    ('GET', r'/api/v1/projectVersions/(\d+)/issues', FakeSSC._issues),
+    ('GET', r'/api/v1/projectVersions/(\d+)/issues/(\d+)', FakeSSC._issue),
+    ('POST', r'/api/v1/projectVersions/(\d+)/issues/action/(audit|suppress)', FakeSSC._issue_action),
+    ('GET', r'/api/v1/projectVersions/(\d+)/issueSummaries', FakeSSC._issue_summaries),
+    ('GET', r'/api/v1/projectVersions/(\d+)/artifacts', FakeSSC._version_artifacts),
+    ('POST', r'/api/v1/projectVersions/(\d+)/artifacts', FakeSSC._upload_artifact),
+    ('GET', r'/api/v1/artifacts/(\d+)', FakeSSC._get_artifact),
+    ('POST', r'/api/v1/fileTokens', FakeSSC._file_token),
+    ('GET', r'/api/v1/cloudjobs', FakeSSC._cloudjobs),
+    ('POST', r'/api/v1/cloudjobs/action/cancel', FakeSSC._cancel_cloudjobs),
+    ('GET', r'/api/v1/cloudjobs/([\w-]+)', FakeSSC._cloudjob),
+    ('GET', r'/api/v1/(engineTypes|coreRulepacks|bugtrackers|cloudpools|attributeDefinitions|issueTemplates)',
+     FakeSSC._reference),
+    ('POST', r'/api/v1/bulk', FakeSSC._bulk),
+]]
+
+
+def _fpr_bytes(seed, size):
+    r = random.Random(seed)
+    return bytes(r.getrandbits(8) for _ in range(min(size, 4096))) * (size // 4096 + 1)
+
+
+def _multipart_file(content_type, body):
+    boundary = re.search(r'boundary=("?)([^";]+)\1', content_type).group(2).encode()
+    for part in body.split(b'--' + boundary):
+        head, _, content = part.partition(b'\r\n\r\n')
+        name = re.search(rb'filename="([^"]*)"', head)
+        if name:
+            return name.group(1).decode(), content[:-2] if content.endswith(b'\r\n') else content
+    raise _Response(400, "No file in the upload")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    ssc = None  # type: FakeSSC
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self, method):
+        parts = urlsplit(self.path)
+        query = dict(parse_qsl(parts.query))
+        length = int(self.headers.get('Content-Length') or 0)
+        raw = self.rfile.read(length) if length else b''
+        content_type = self.headers.get('Content-Type', '')
+        try:
+            if content_type.startswith('multipart/form-data'):
+                body = _multipart_file(content_type, raw)
+            else:
+                body = json.loads(raw) if raw else None
+            status, data, headers = self.ssc.handle(method, parts.path, query, body, self.headers)
+        except _Response as e:
+            status, data, headers = e.status, {'message': str(e), 'responseCode': e.status}, {}
+        if isinstance(data, bytes):
+            payload, content_type = data, 'application/octet-stream'
+        else:
+            payload, content_type = json.dumps(data).encode(), 'application/json;charset=UTF-8'
+        interrupt = headers.pop('X-Fake-Interrupt', None)
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        for k, v in headers.items():
+            self.send_header(k, v)
+        self.end_headers()
+        if interrupt is not None:
+            self.wfile.write(payload[:int(interrupt)])
+            self.wfile.flush()
+            self.close_connection = True
+            return
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_PUT(self):
+        self._handle('PUT')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+
+class FakeSSCTestCase(TestCase):
+    """
+    Runs each test against its own py:class:`FakeSSC`, `self.ssc`, with `self.client` a
+    py:class:`fortifyapi.client.FortifySSCClient` using its token. Set `fake_options` or `client_options` on the
+    subclass to pass arguments to either.
+    """
+    fake_options = {}
+    client_options = {}
+
+    def setUp(self):
+        from .client import FortifySSCClient
+        self.ssc = FakeSSC(**self.fake_options).start()
+        self.addCleanup(self.ssc.stop)
+        self.client = FortifySSCClient(self.ssc.url, self.ssc.token, **self.client_options)
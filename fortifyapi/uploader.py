@@ -0,0 +1,180 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from os.path import basename, getsize
+from requests_toolbelt import MultipartEncoder, MultipartEncoderMonitor
+from .client import Artifact
+
+
+class ArtifactUploader:
+    """
+    Upload many artifacts at once and wait for SSC to process them, e.g.
+
+        with ArtifactUploader(client.api, workers=4) as uploader:
+            futures = [uploader.upload(version, path) for version, path in scans]
+        artifacts = [f.result() for f in futures]
+
+    Uploads stream from disk on a pool of `workers` threads. Processing is watched by one thread for all of them:
+    each round it lists the newest artifacts of every version that still has some pending, then sleeps for a delay
+    that starts at `poll_initial` and doubles up to `poll_max`. A future completes with the
+    py:class:`fortifyapi.client.Artifact` once its processing finished, successfully or not, so check its `status`.
+    """
+    FINAL_STATES = ('PROCESS_COMPLETE', 'ERROR_PROCESSING', 'REQUIRE_AUTH')
+
+    def __init__(self, api, workers=4, wait=True, poll_initial=1.0, poll_max=30.0, timeout=None, progress=None):
+        """
+        :param api: py:class:`fortifyapi.api.FortifySSCAPI`
+        :param workers: How many files to upload at the same time
+        :param wait: Complete the futures once processing finished, otherwise as soon as the upload finished
+        :param poll_initial: The first delay between processing checks, in seconds
+        :param poll_max: The longest delay between processing checks
+        :param timeout: Fail a future with TimeoutError when processing takes longer than this many seconds
+        :param progress: Called with (file path, bytes sent, file size) while uploading
+        """
+        self.api = api
+        self.wait = wait
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.timeout = timeout
+        self.progress = progress
+        # per file: path, bytes, seconds, bytes_per_sec
+        self.transfers = []
+        self.polls = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._pending = {}
+        self._reset = False
+        self._closed = False
+        self._watcher = None
+        self._cond = threading.Condition()
+
+    def __enter__(self):
+        self.api.__enter__()
+        return self
+
+    def __exit__(self, type, value, traceback):
+        try:
+            self.close()
+        finally:
+            self.api.__exit__(type, value, traceback)
+
+    def upload(self, version, file_path, engine_type=None) -> Future:
+        """
+        :param version: The py:class:`fortifyapi.client.Version` to upload to
+        :param engine_type: The parser to process the artifact with, see /ssc/html/ssc/admin/parserplugins
+        :returns: A future of the py:class:`fortifyapi.client.Artifact`
+        """
+        assert not self._closed, "The uploader is closed"
+        future = Future()
+        self._executor.submit(self._upload, future, version, file_path, engine_type)
+        return future
+
+    def _upload(self, future, version, file_path, engine_type):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            size = getsize(file_path)
+            started = time.monotonic()
+            with open(file_path, 'rb') as f, self.api as api:
+                encoder = MultipartEncoder(fields={'file': (basename(file_path), f, 'application/zip')})
+                callback = (lambda m: self.progress(file_path, m.bytes_read, size)) if self.progress else None
+                monitor = MultipartEncoderMonitor(encoder, callback)
+                query = dict(engineType=engine_type) if engine_type else {}
+                data = api._request('POST', f"/api/v1/projectVersions/{version['id']}/artifacts", data=monitor,
+                                    params=query, headers={'Content-Type': monitor.content_type})['data']
+            seconds = time.monotonic() - started
+            with self._cond:
+                self.transfers.append(dict(path=file_path, bytes=size, seconds=seconds,
+                                           bytes_per_sec=size / max(seconds, 1e-9)))
+            artifact = Artifact(self.api, data, version)
+        except Exception as e:
+            future.set_exception(e)
+            return
+        if not self.wait or artifact['status'] in self.FINAL_STATES:
+            future.set_result(artifact)
+            return
+        with self._cond:
+            self._pending[artifact['id']] = (future, version, time.monotonic())
+            self._reset = True
+            if self._watcher is None:
+                self._watcher = threading.Thread(target=self._watch, name='ArtifactUploader', daemon=True)
+                self._watcher.start()
+            self._cond.notify_all()
+
+    def _watch(self):
+        try:
+            delay = self.poll_initial
+            while True:
+                with self._cond:
+                    while not self._pending:
+                        if self._closed:
+                            self._watcher = None
+                            return
+                        self._cond.wait()
+                    if self._reset:
+                        delay, self._reset = self.poll_initial, False
+                    pending = dict(self._pending)
+                # not woken by new uploads, they are picked up on the next round
+                time.sleep(delay)
+                self._poll(pending)
+                delay = min(delay * 2, self.poll_max)
+        except BaseException as e:
+            # nobody is left to complete the futures
+            self._fail_pending(e)
+            raise
+
+    def _fail_pending(self, error):
+        with self._cond:
+            pending, self._pending = self._pending, {}
+            self._watcher = None
+            self._cond.notify_all()
+        for future, _, _ in pending.values():
+            future.set_exception(error)
+
+    def _poll(self, pending):
+        self.polls += 1
+        by_version = {}
+        for aid, (future, version, started) in pending.items():
+            by_version.setdefault(version['id'], []).append(aid)
+        with self.api as api:
+            for vid, ids in by_version.items():
+                try:
+                    listed = api.get(f"/api/v1/projectVersions/{vid}/artifacts", start=0,
+                                     limit=max(50, 2 * len(ids)), orderby='-uploadDate')['data']
+                    found = {a['id']: a for a in listed if a['id'] in ids}
+                    for aid in set(ids) - set(found):
+                        # pushed off the first page by other uploads
+                        found[aid] = api.get(f"/api/v1/artifacts/{aid}")['data']
+                except Exception:
+                    # try again next round, `timeout` bounds how long
+                    found = {}
+                for aid in ids:
+                    future, version, started = pending[aid]
+                    if aid in found and found[aid]['status'] in self.FINAL_STATES:
+                        if self._forget(aid):
+                            future.set_result(Artifact(self.api, found[aid], version))
+                    elif self.timeout and time.monotonic() - started > self.timeout:
+                        if self._forget(aid):
+                            future.set_exception(
+                                TimeoutError(f"Artifact {aid} was not processed within {self.timeout} seconds"))
+
+    def _forget(self, aid) -> bool:
+        """ :returns: If the artifact was still pending, i.e. its future is ours to complete """
+        with self._cond:
+            return self._pending.pop(aid, None) is not None
+
+    def close(self, timeout=None):
+        """
+        Wait for every upload and, if `wait`, its processing
+
+        :param timeout: The most seconds to wait for processing, after which the futures still waiting fail with
+                        TimeoutError
+        """
+        self._executor.shutdown(wait=True)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            watcher = self._watcher
+        if watcher is not None:
+            watcher.join(timeout)
+            if watcher.is_alive():
+                self._fail_pending(TimeoutError(f"Artifacts were not processed within {timeout} seconds of close"))
@@ -48,6 +48,7 @@ setup(
     test_suite='nose.collector',
     tests_require=['nose'],
     install_requires=['requests', 'requests-toolbelt'],
+    extras_require={'async': ['aiohttp']},
     keywords=['fortify', 'api', 'security', 'software', 'microfocus', 'ssc', 'sast'],
     classifiers=[
         'Development Status :: 4 - Beta',
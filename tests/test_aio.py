@@ -0,0 +1,50 @@
+import asyncio
+from unittest import TestCase, skipIf
+from constants import Constants
+from fortifyapi.aio import aiohttp, AsyncFortifySSCClient
+
+
+@skipIf(aiohttp is None, "aiohttp is not installed")
+class TestAsyncClient(TestCase):
+    c = Constants()
+
+    def _client(self):
+        return AsyncFortifySSCClient(self.c.url, self.c.token, proxies=self.c.proxies)
+
+    def test_project_list(self):
+        async def run():
+            async with self._client() as client:
+                return [p async for p in client.projects.list()]
+
+        projects = asyncio.run(run())
+        self.assertGreater(len(projects), 0)
+        self.assertIsNotNone(projects[0]['id'])
+
+    def test_page_concurrent(self):
+        async def run():
+            async with self._client() as client:
+                ordered = [p['id'] async for p in client.projects.list(limit=5)]
+                concurrent = [p['id'] async for p in client.projects.list(limit=5, concurrency=4)]
+                return ordered, concurrent
+
+        ordered, concurrent = asyncio.run(run())
+        self.assertEqual(ordered, concurrent)
+
+    def test_version_issues(self):
+        async def run():
+            async with self._client() as client:
+                async for project in client.projects.list():
+                    async for version in project.versions.list():
+                        return version, [i async for i in version.issues.list()]
+
+        version, issues = asyncio.run(run())
+        self.assertIsNotNone(version['id'])
+        self.assertIsNotNone(issues)
+
+    def test_gather(self):
+        async def run():
+            async with self._client() as client:
+                return await asyncio.gather(*[client.api.get('/api/v1/projects', limit=1) for _ in range(10)])
+
+        results = asyncio.run(run())
+        self.assertEqual(10, len(results))
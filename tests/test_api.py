@@ -1,6 +1,14 @@
-from unittest import TestCase
+import json
+import threading
+import time
+from unittest import TestCase, mock
 from constants import Constants
+from urllib3.exceptions import ProtocolError
 from fortifyapi import FortifySSCAPI
+from fortifyapi.api import _ObservedRetry, iter_json_items
+from fortifyapi.exceptions import ResponseException
+from fortifyapi.limiter import AdaptiveLimiter
+from fortifyapi.testing import FakeSSC, FakeSSCTestCase
 
 
 class TestAPI(TestCase):
@@ -62,4 +70,157 @@ class TestAPI(TestCase):
             self.assertGreater(len(results), 0)
             self.assertEqual(count, len(results))
 
+    def test_api_persistent(self):
+        fapi = FortifySSCAPI(self.c.url, self.c.credentials, persistent=True)
+        if self.c.proxies:
+            fapi.proxies = self.c.proxies
+        with fapi as api:
+            with api as nested:
+                self.assertIsNotNone(nested.get('/api/v1/projects', limit=1))
+            # the nested exit must not revoke the token out from under us
+            self.assertIsNotNone(api._token)
+        session, token = fapi._session, fapi._token
+        self.assertIsNotNone(session)
+        with fapi as api:
+            api.get('/api/v1/projects', limit=1)
+        self.assertIs(session, fapi._session)
+        self.assertEqual(token, fapi._token)
+        fapi.close()
+        self.assertIsNone(fapi._session)
+        self.assertIsNone(fapi._token)
+
+    def test_page_concurrent(self):
+        fapi = FortifySSCAPI(self.c.url, self.c.token)
+        if self.c.proxies:
+            fapi.proxies = self.c.proxies
+        with fapi as api:
+            expected = [e['id'] for e in api.page_data('/api/v1/projects', limit=5)]
+            results = [e['id'] for e in api.page_data('/api/v1/projects', limit=5, concurrency=4)]
+            self.assertEqual(expected, results)
+            results = [e['id'] for e in api.page_data('/api/v1/projects', limit=5, concurrency=4, ordered=False)]
+            self.assertCountEqual(expected, results)
+
+    def test_page_prefetch(self):
+        fapi = FortifySSCAPI(self.c.url, self.c.token)
+        if self.c.proxies:
+            fapi.proxies = self.c.proxies
+        with fapi as api:
+            expected = [e['id'] for e in api.page_data('/api/v1/projects', limit=5)]
+            results = [e['id'] for e in api.page_data('/api/v1/projects', limit=5, prefetch=2)]
+            self.assertEqual(expected, results)
+
+    def test_stream(self):
+        fapi = FortifySSCAPI(self.c.url, self.c.token)
+        if self.c.proxies:
+            fapi.proxies = self.c.proxies
+        with fapi as api:
+            expected = api.get('/api/v1/projects', limit=-1)['data']
+            self.assertEqual(expected, list(api.stream_data('/api/v1/projects', limit=-1, chunk_size=1024)))
+            self.assertEqual(expected, list(api.page_data('/api/v1/projects', limit=-1)))
+
+    def test_batch(self):
+        fapi = FortifySSCAPI(self.c.url, self.c.token)
+        if self.c.proxies:
+            fapi.proxies = self.c.proxies
+        with fapi.batch(size=2) as batch:
+            futures = [batch.add('GET', '/api/v1/projects?limit=1') for _ in range(3)]
+            # the first two went out as soon as the batch was full
+            self.assertTrue(futures[0].done())
+            self.assertFalse(futures[2].done())
+        for f in futures:
+            self.assertIn('data', f.result())
+
+    def test_limiter(self):
+        limiter = AdaptiveLimiter(initial=2, maximum=8, window=5)
+        fapi = FortifySSCAPI(self.c.url, self.c.token, limiter=limiter)
+        if self.c.proxies:
+            fapi.proxies = self.c.proxies
+        with fapi as api:
+            results = list(api.page_data('/api/v1/projects', limit=5, concurrency=8))
+            self.assertGreater(len(results), 0)
+        self.assertEqual(0, limiter.in_flight)
+        self.assertGreaterEqual(limiter.limit, limiter.minimum)
+        self.assertLessEqual(limiter.limit, limiter.maximum)
+
+    def test_metrics(self):
+        fapi = FortifySSCAPI(self.c.url, self.c.token)
+        if self.c.proxies:
+            fapi.proxies = self.c.proxies
+        with fapi as api:
+            projects = list(api.page_data('/api/v1/projects', limit=5))
+            api.get(f"/api/v1/projects/{projects[0]['id']}")
+        metrics = fapi.metrics.as_dict()
+        self.assertGreater(metrics[('GET', '/api/v1/projects')]['count'], 0)
+        self.assertEqual(1, metrics[('GET', '/api/v1/projects/{id}')]['count'])
+        self.assertGreater(metrics[('GET', '/api/v1/projects/{id}')]['bytes_in'], 0)
+        text = fapi.metrics.prometheus()
+        self.assertIn('fortifyapi_requests_total{method="GET",endpoint="/api/v1/projects/{id}"} 1', text)
+
+
+class TestIterJsonItems(TestCase):
+
+    def items(self, body, chunk_size):
+        data = body.encode()
+        response = mock.Mock(encoding='utf-8')
+        response.iter_content.side_effect = lambda n: (data[i:i + n] for i in range(0, len(data), n))
+        return list(iter_json_items(response, chunk_size=chunk_size))
+
+    def test_split_numbers(self):
+        data = [1.5e3, -2, 0.25, -1e-3, 10, True, None, {'n': -4.5E+2}]
+        body = json.dumps({'count': -1.5, 'data': data}).replace('1500.0', '1.5e3')
+        for chunk_size in range(1, 5):
+            self.assertEqual(data, self.items(body, chunk_size), f"chunk_size={chunk_size}")
+        self.assertEqual([1500.0], self.items('{"data":[1.5e3]}', 3))
+
+
+class TestBulkBatcher(FakeSSCTestCase):
+
+    def test_missing_responses(self):
+        with self.client.api as api:
+            bulk_request = api.bulk_request
+            api.bulk_request = lambda reqs: {'data': bulk_request(reqs)['data'][:2]}
+            with api.batch(size=10) as batch:
+                futures = [batch.add('GET', '/api/v1/engineTypes') for _ in range(3)]
+        self.assertIsNone(futures[1].exception(timeout=0))
+        self.assertIsInstance(futures[2].exception(timeout=0), ResponseException)
+
+    def test_add_while_sending(self):
+        self.ssc.latency = 0.3
+        with self.client.api as api:
+            batch = api.batch(size=10)
+            batch.add('GET', '/api/v1/engineTypes')
+            sending = threading.Thread(target=batch.flush)
+            sending.start()
+            time.sleep(0.1)
+            started = time.monotonic()
+            future = batch.add('GET', '/api/v1/engineTypes')
+            self.assertLess(time.monotonic() - started, 0.1, 'add does not wait for the request on the wire')
+            sending.join()
+            batch.flush()
+        self.assertEqual(2, self.ssc.request_count('POST', '*/bulk'))
+        self.assertIsNone(future.exception(timeout=0))
+
+
+class TestObservedRetry(TestCase):
+
+    def test_one_cut_per_request(self):
+        api = FortifySSCAPI('https://ssc.example.com/ssc', 'token', limiter=AdaptiveLimiter(initial=16))
+        retry = _ObservedRetry(total=5, status_forcelist=[503])
+        retry.api = api
+        api._sending.started = time.monotonic()
+        for _ in range(3):
+            retry = retry.increment('GET', '/api/v1/projects', error=ProtocolError('reset'))
+        self.assertEqual(8, api.limiter.limit, 'the retries of one request count once')
+        api._sending.started = time.monotonic()
+        retry.increment('GET', '/api/v1/projects', error=ProtocolError('reset'))
+        self.assertEqual(4, api.limiter.limit)
 
+    def test_fake_ssc(self):
+        ssc = FakeSSC().start()
+        self.addCleanup(ssc.stop)
+        api = FortifySSCAPI(ssc.url, ssc.token, limiter=AdaptiveLimiter(initial=16))
+        ssc.fail_next(2, 503, '*/engineTypes')
+        with api:
+            self.assertIn('data', api.get('/api/v1/engineTypes'))
+        self.assertEqual(3, ssc.request_count('GET', '*/engineTypes'), 'retried over http too')
+        self.assertEqual(8, api.limiter.limit, 'both retries of the request count once')
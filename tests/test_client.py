@@ -1,6 +1,7 @@
 from unittest import TestCase
 from constants import Constants
 from fortifyapi import FortifySSCClient
+from fortifyapi.cache import ResponseCache
 from fortifyapi.client import Project
 
 
@@ -44,3 +45,27 @@ class TestClient(TestCase):
         project['bar'] = True
         self.assertEqual(str(project), "<class 'fortifyapi.client.Project'>({'bar': True})")
 
+
+    def test_cache(self):
+        client = FortifySSCClient(self.c.url, self.c.token, cache=True)
+        self.c.setup_proxy(client)
+        first = list(client.list_engine_types())
+        self.assertEqual(0, client.api.cache.hits)
+        second = list(client.list_engine_types())
+        self.assertEqual(first, second)
+        self.assertGreater(client.api.cache.hits, 0)
+        # not reference data, never cached
+        size = client.api.cache.stats()['size']
+        list(client.projects.list(limit=1))
+        self.assertEqual(size, client.api.cache.stats()['size'])
+
+
+class TestResponseCache(TestCase):
+
+    def test_ttl(self):
+        cache = ResponseCache()
+        self.assertEqual(300, cache.ttl('/api/v1/cloudpools'))
+        self.assertEqual(300, cache.ttl('/api/v1/cloudpools/abc?fields=name'))
+        self.assertIsNone(cache.ttl('/api/v1/cloudpools/abc/jobs'))
+        self.assertIsNone(cache.ttl('/api/v1/cloudpools/disabledWorkers'))
+        self.assertIsNone(cache.ttl('/api/v1/projectVersions'))
@@ -1,7 +1,9 @@
+from datetime import datetime, timedelta, timezone
 from unittest import TestCase
 from pprint import pprint
 from constants import Constants
 from fortifyapi import FortifySSCClient
+from fortifyapi.testing import FakeSSCTestCase
 
 
 class TestCloudJobs(TestCase):
@@ -13,3 +15,62 @@ class TestCloudJobs(TestCase):
         jobs = list(client.cloudjobs.list())
         # no guarantee a job is running, this is all we'll test for now
         self.assertIsNotNone(jobs)
+
+
+class TestFakeSSCCloudJobs(FakeSSCTestCase):
+
+    def test_watch(self):
+        version = self.ssc.add_version('fake project', 'scanned')
+        now = datetime.now(timezone.utc)
+        for i in range(120):
+            self.ssc.add_cloudjob('UPLOAD_COMPLETED', version['id'], queued=now - timedelta(hours=1, minutes=i))
+        running = self.ssc.add_cloudjob('PENDING', version['id'], queued=now - timedelta(minutes=5))
+        events = []
+        watcher = self.client.cloudjobs.watch(callback=events.append)
+        self.assertEqual([(running['jobToken'], None, 'PENDING')], [e[:3] for e in watcher.poll()])
+        self.assertEqual([], watcher.poll())
+
+        self.ssc.set_job_state(running['jobToken'], 'SCAN_RUNNING')
+        queued = [self.ssc.add_cloudjob('PENDING', version['id'], queued=now + timedelta(seconds=i))
+                  for i in range(3)]
+        before = self.ssc.request_count()
+        self.assertEqual([(j['jobToken'], None, 'PENDING') for j in queued] +
+                         [(running['jobToken'], 'PENDING', 'SCAN_RUNNING')], [e[:3] for e in watcher.poll()])
+        self.assertEqual(2, self.ssc.request_count() - before, 'one page of new jobs, one re-check')
+
+        for job in queued + [running]:
+            self.ssc.set_job_state(job['jobToken'], 'UPLOAD_COMPLETED')
+        self.assertEqual(4, len(watcher.poll()))
+        self.assertEqual({}, watcher.active)
+        self.assertEqual(1 + 4 + 4, len(events))
+        self.assertEqual('UPLOAD_COMPLETED', events[-1].job['jobState'])
+
+        since = self.client.cloudjobs.watch(since=timedelta(minutes=30))
+        self.assertEqual(4, len(since.poll()), 'the jobs queued in the last 30 minutes')
+
+    def test_cancel_many(self):
+        version = self.ssc.add_version('fake project', 'scanned')
+        pending = [self.ssc.add_cloudjob('PENDING', version['id'])['jobToken'] for _ in range(45)]
+        done = self.ssc.add_cloudjob('UPLOAD_COMPLETED', version['id'])['jobToken']
+        self.ssc.add_cloudjob('SCAN_RUNNING', version['id'])
+        jobs = self.client.cloudjobs
+        result = jobs.cancel_many(pending[:20] + ['unknown'] + pending[20:25], chunk_size=10)
+        self.assertEqual(sorted(pending[:25]), sorted(result['canceled']))
+        self.assertEqual(['unknown'], list(result['failed']))
+        # 3 chunks, the one with the unknown token split in halves down to it
+        self.assertEqual(3 + 2 + 2, self.ssc.request_count('POST', '*/cloudjobs/action/cancel'))
+
+        before = self.ssc.request_count('POST', '*/cloudjobs/action/cancel')
+        self.ssc.fail_next(1, 503, '*/cloudjobs/action/cancel')
+        result = jobs.cancel_many(pending[25:35], chunk_size=10)
+        self.assertEqual(set(pending[25:35]), set(result['failed']), 'a server error says nothing about the tokens')
+        self.assertEqual(1, self.ssc.request_count('POST', '*/cloudjobs/action/cancel') - before)
+
+        result = jobs.cancel_many(q='jobState:PENDING+or+jobState:UPLOAD_COMPLETED', chunk_size=10)
+        self.assertEqual(set(pending[25:]), set(result['canceled']))
+        self.assertEqual([done], result['skipped'])
+        self.assertEqual({'SCAN_CANCELED'}, {self.ssc.cloudjobs[t]['jobState'] for t in pending})
+
+        running = next(jobs.list(q='jobState:SCAN_RUNNING'))
+        jobs.cancel(running['jobToken'])
+        self.assertEqual('SCAN_CANCELED', self.ssc.cloudjobs[running['jobToken']]['jobState'])
@@ -0,0 +1,13 @@
+from fortifyapi.fortify import FortifyApi
+from fortifyapi.testing import FakeSSCTestCase
+
+
+class TestFortifyApi(FakeSSCTestCase):
+
+    def test_retries(self):
+        version = self.ssc.add_version('fake project', '1.0')
+        with FortifyApi(self.ssc.url, token=self.ssc.token, retries=2) as api:
+            self.ssc.fail_next(2, 503)
+            self.assertTrue(api.get_project_version(str(version['id'])).success)
+            self.ssc.fail_next(3, 503)
+            self.assertFalse(api.get_project_version(str(version['id'])).success)
@@ -0,0 +1,47 @@
+from fortifyapi.index import IssueIndex
+from fortifyapi.testing import FakeSSCTestCase
+
+
+class TestIssueIndex(FakeSSCTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.versions = [self.ssc.add_version(f"project {i % 2}", f"version {i}", issues=100) for i in range(4)]
+        self.index = IssueIndex(self.client)
+        self.addCleanup(self.index.close)
+
+    def test_sync(self):
+        self.assertEqual(dict(versions=4, changed=4, fetched=400, deleted=0), self.index.sync())
+        before = self.ssc.request_count()
+        self.assertEqual(dict(versions=4, changed=0, fetched=0, deleted=0), self.index.sync())
+        self.assertEqual(1, self.ssc.request_count() - before, 'nothing changed, only the versions are listed')
+
+        version = self.client.versions.get(self.versions[0]['id'])
+        issues = list(version.issues.list())[:4]
+        issues[0].suppress()
+        for issue in issues[1:]:
+            self.ssc.issues[version['id']][issue['id']]['revision'] += 1
+        before = self.ssc.request_count()
+        self.assertEqual(dict(versions=4, changed=1, fetched=4, deleted=0), self.index.sync())
+        self.assertEqual(3, self.ssc.request_count() - before, 'the changed issues come in one listing')
+        self.assertEqual([issues[0]['id']], [i['id'] for i in self.index.filter(suppressed=True)])
+        self.assertEqual(400, self.index.count(), 'suppressed issues stay in the index')
+
+    def test_queries(self):
+        issues = list(self.ssc.issues[self.versions[1]['id']].values())
+        issues[0]['hidden'] = issues[1]['removed'] = True
+        self.index.sync()
+        self.assertEqual(400, self.index.count())
+        self.assertEqual(1, self.index.count(hidden=True))
+        self.assertEqual(399, self.index.count(removed=False))
+        self.assertEqual(100, self.index.count(projectVersionId=self.versions[0]['id']))
+        by_friority = self.index.group_by('friority')
+        self.assertEqual(400, sum(by_friority.values()))
+        self.assertEqual(by_friority['Critical'], self.index.count(friority='Critical'))
+        by_project = self.index.group_by('projectName', 'friority')
+        self.assertEqual(200, sum(n for (p, _), n in by_project.items() if p == 'project 0'))
+        top = self.index.filter(friority=['Critical', 'High'], order_by='-severity', limit=10)
+        self.assertEqual(10, len(top))
+        self.assertEqual(sorted((i['severity'] for i in top), reverse=True), [i['severity'] for i in top])
+        with self.assertRaises(ValueError):
+            self.index.count(**{'id; DROP TABLE issues': 1})
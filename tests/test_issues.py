@@ -4,6 +4,7 @@ from os import path
 import time
 from constants import Constants
 from fortifyapi import FortifySSCClient, Issue, CloneVersionTemplate
+from fortifyapi.testing import FakeSSCTestCase
 
 
 class TestIssues(TestCase):
@@ -55,3 +56,44 @@ class TestIssues(TestCase):
         finally:
             pv.parent.delete()
             pass
+
+
+class TestFakeSSCIssues(FakeSSCTestCase):
+
+    def test_records(self):
+        version = self.client.versions.get(self.ssc.add_version('fake project', '1.0', issues=450)['id'])
+        records = list(version.issues.list(records=True))
+        self.assertEqual(450, len(records))
+        self.assertEqual(Issue.FIELDS['lite'], records[0]._fields)
+        self.assertIs(type(records[0]), type(records[-1]))
+        issue = version.issues.upgrade(records[0])
+        self.assertEqual(records[0].issueInstanceId, issue['issueInstanceId'])
+        self.assertIn('suppressed', issue)
+        version.issues.upgrade(records[1], fetch=False).suppress()
+        self.assertTrue(self.ssc.issues[version['id']][records[1].id]['suppressed'])
+        batches = list(version.issues.list(columns=200, fields=['id', 'friority'],
+                                            showsuppressed=True))
+        self.assertEqual([200, 200, 50], [len(b['id']) for b in batches])
+        self.assertEqual([r.id for r in records], [i for b in batches for i in b['id']])
+
+    def test_audit_many(self):
+        version = self.client.versions.get(self.ssc.add_version('fake project', '1.0', issues=450)['id'])
+        records = list(version.issues.list(records=True))
+        issues = self.ssc.issues[version['id']]
+        for r in records[::100]:
+            issues[r.id]['revision'] += 1
+        del issues[records[1].id]
+        result = version.issues.audit_many(records, Issue.NOT_AN_ISSUE, chunk_size=200)
+        self.assertEqual(dict(updated=449, refreshed=5, failed=[records[1].id]), result)
+        self.assertEqual(3 * 2, self.ssc.request_count('POST', '*/issues/action/audit'), 'every chunk conflicts once')
+        self.assertTrue(all(i['primaryTag'] == 'Not an Issue' for i in issues.values()))
+        # 3 pages of records, then the conflicting chunks of 200, 200 and 50 are read again, 50 ids a time
+        self.assertEqual(3 + 4 + 4 + 1, self.ssc.request_count('GET', '*/issues'))
+        result = version.issues.suppress_many(version.issues.list(fields='lite'))
+        self.assertEqual(dict(updated=449, refreshed=0, failed=[]), result)
+        self.assertEqual(1, self.ssc.request_count('POST', '*/issues/action/suppress'))
+
+        suppressed = list(version.issues.list(fields='lite', showsuppressed=True))
+        issues[suppressed[0]['id']]['revision'] += 1
+        result = version.issues.suppress_many(suppressed, suppressed=False)
+        self.assertEqual(dict(updated=449, refreshed=1, failed=[]), result, 'suppressed issues are not gone')
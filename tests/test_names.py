@@ -0,0 +1,113 @@
+from fortifyapi import FortifySSCClient
+from fortifyapi.names import NameIndex
+from fortifyapi.testing import FakeSSCTestCase
+
+
+class TestNameIndex(FakeSSCTestCase):
+    client_options = dict(names=True)
+
+    def setUp(self):
+        super().setUp()
+        for i in range(30):
+            self.ssc.add_version(f"project {i % 3}", f"version {i}")
+
+    def requests(self):
+        return self.ssc.request_count()
+
+    def test_upsert_hit(self):
+        with self.client as client:
+            v = client.projects.upsert('project 1', 'version 4')
+            self.assertEqual(1, self.requests(), 'one listing warms the index')
+            self.assertEqual(('project 1', 'version 4'), (v.parent['name'], v['name']))
+            self.assertEqual(v['id'], client.projects.upsert('project 1', 'version 4')['id'])
+            self.assertEqual(1, self.requests(), 'a hit is answered locally')
+        self.assertEqual(2, self.client.api.names.hits)
+
+    def test_partial_hit(self):
+        with self.client as client:
+            v = client.projects.upsert('project 1', 'version 4')
+            self.assertNotIn('dataRetentionPolicyOverride', v)
+            copy = v.copy('copy')
+            self.assertEqual('copy', copy['name'])
+            self.assertIn('currentState', v, 'read in full once another field was asked for')
+            with self.assertRaises(KeyError):
+                v['no such field']
+
+    def test_options(self):
+        for off in (None, False, 0):
+            self.assertIsNone(FortifySSCClient(self.ssc.url, self.ssc.token, names=off, cache=off,
+                                               limiter=off).api.names)
+        with FortifySSCClient(self.ssc.url, self.ssc.token, names=False) as client:
+            self.assertEqual('version 4', client.projects.upsert('project 1', 'version 4')['name'])
+
+    def test_upsert_miss(self):
+        with self.client as client:
+            client.projects.upsert('project 1', 'warmup')
+            before = self.requests()
+            v = client.projects.upsert('project 2', 'new version')
+            self.assertEqual(0, self.ssc.request_count('POST', '/ssc/api/v1/projects/action/test'),
+                             'a known project is not looked up')
+            self.assertEqual(1, self.ssc.request_count('GET', '/ssc/api/v1/projectVersions'),
+                             'nor searched for, the one listing is the warm-up')
+            self.assertGreater(self.requests(), before)
+            before = self.requests()
+            self.assertEqual(v['id'], client.projects.upsert('project 2', 'new version')['id'])
+            self.assertEqual(before, self.requests(), 'created versions are indexed')
+
+            p = client.projects.upsert('other project', 'v1')
+            self.assertEqual('other project', p.parent['name'])
+            self.assertEqual(1, self.ssc.request_count('POST', '/ssc/api/v1/projects/action/test'))
+
+    def test_found_elsewhere(self):
+        with self.client as client:
+            client.projects.upsert('project 0', 'version 0')
+            vid = self.ssc.add_version('project 0', 'created by someone else')['id']
+            self.assertEqual(vid, client.projects.upsert('project 0', 'created by someone else')['id'])
+            self.assertEqual(1, len([v for v in self.ssc.versions.values()
+                                     if v['name'] == 'created by someone else']))
+
+    def test_delete(self):
+        names = self.client.api.names
+        with self.client as client:
+            v = client.projects.upsert('project 0', 'version 0')
+            v.delete()
+            self.assertIsNone(names.version('project 0', 'version 0'))
+            self.assertIsNotNone(names.project('project 0'))
+            for v in list(client.versions.search(q='project.name:"project 0"')):
+                v.delete()
+            self.assertIsNone(names.project('project 0'))
+            self.assertEqual(20, len(names))
+
+    def test_delete_failed(self):
+        names = self.client.api.names
+        with self.client as client:
+            v = client.projects.upsert('project 0', 'version 0')
+            self.ssc.fail_next(status=400, path='*/bulk')
+            result = client.versions.delete_many([v])
+            self.assertEqual([v['id']], list(result['failed']))
+            self.assertIsNotNone(names.version('project 0', 'version 0'), 'still there, so still known')
+            result = client.versions.delete_many([v])
+            self.assertEqual([v['id']], result['deleted'])
+            self.assertIsNone(names.version('project 0', 'version 0'))
+
+    def test_bookkeeping(self):
+        names = NameIndex()
+        project = {'id': 1, 'name': 'p'}
+        for vid, name in ((1, 'a'), (2, 'b'), (3, 'b'), (1, 'c')):
+            names.add({'id': vid, 'name': name, 'project': project})
+        self.assertEqual(2, len(names), 'b replaced by another id, a renamed to c')
+        self.assertIsNone(names.version('p', 'a'))
+        names.remove(2)
+        self.assertEqual(3, names.version('p', 'b')['id'], 'the replaced id is no longer known')
+        names.remove(1)
+        self.assertIsNotNone(names.project('p'))
+        names.remove(3)
+        self.assertIsNone(names.project('p'))
+        self.assertEqual(0, len(names))
+
+    def test_max_age(self):
+        self.client.api.names.max_age = 0
+        with self.client as client:
+            client.projects.upsert('project 0', 'version 0')
+            client.projects.upsert('project 0', 'version 0')
+        self.assertEqual(2, self.client.api.names.warmups)
@@ -3,6 +3,7 @@ from constants import Constants
 from random import randint
 from fortifyapi.exceptions import *
 from fortifyapi import FortifySSCClient, Query
+from fortifyapi.testing import FakeSSCTestCase
 
 import time
 
@@ -119,3 +120,21 @@ class TestProjects(TestCase):
         self.assertIsNotNone(res)
         print(res)
         self.assertEqual(res['project']['name'], project_name)
+
+
+class TestFakeSSCProjects(FakeSSCTestCase):
+
+    def test_create_many(self):
+        self.ssc.add_version('fake project', '1.0')
+        pairs = [(f"app {i % 5}", f"v{i}") for i in range(40)] + [('fake project', 'new'), ('fake project', '1.0')]
+        before = self.ssc.request_count()
+        with self.client.api.batch(size=50):
+            # create_many runs its own batches, an outer one does not get in the way
+            result = self.client.projects.create_many(pairs, size=50)
+        self.assertEqual(pairs[:-1], [(v.parent['name'], v['name']) for v in result['created']])
+        self.assertEqual([('fake project', '1.0')], list(result['failed']))
+        self.assertTrue(all(v['committed'] for v in result['created']), 'the template commits the versions')
+        self.assertEqual(6, len(self.ssc.projects))
+        # project listing, 2 rounds of creates, 41 * 6 template requests, the re-read
+        self.assertEqual(1 + 2 + 5 + 1, self.ssc.request_count() - before)
+        self.assertEqual('name:"v0"+or+name:"v1"', str(Query.any_of('name', ['v0', 'v1'])))
@@ -0,0 +1,42 @@
+import os
+import tempfile
+from fortifyapi import FortifySSCClient
+from fortifyapi.summary import SummaryTable
+from fortifyapi.testing import FakeSSCTestCase
+
+
+class TestIssueSummaries(FakeSSCTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.versions = [self.ssc.add_version(f"project {i % 3}", f"version {i}", issues=10) for i in range(12)]
+
+    def test_fan_out(self):
+        progress = []
+        table = self.client.issue_summaries(workers=4, progress=lambda done, total: progress.append((done, total)))
+        self.assertEqual({v['id'] for v in self.versions}, set(table))
+        self.assertEqual(120, sum(table.totals().values()))
+        self.assertEqual(12 * 4, len(table.counts()))
+        self.assertEqual((12, 12), progress[-1])
+        self.assertEqual(12, self.ssc.request_count('GET', '*/issueSummaries'))
+
+    def test_incremental(self):
+        self.client.issue_summaries()
+        version = self.client.versions.get(self.versions[0]['id'])
+        next(version.issues.list()).suppress()
+        self.client.issue_summaries()
+        self.assertEqual(13, self.ssc.request_count('GET', '*/issueSummaries'), 'only the changed version again')
+        self.client.issue_summaries(refresh=True)
+        self.assertEqual(25, self.ssc.request_count('GET', '*/issueSummaries'))
+
+    def test_saved(self):
+        self.ssc.fail_next(1, 403, '*/issueSummaries')
+        table = self.client.issue_summaries()
+        self.assertEqual(1, len(table.errors()))
+        with tempfile.TemporaryDirectory() as tmp:
+            table.save(os.path.join(tmp, 'summaries.json'))
+            loaded = SummaryTable.load(os.path.join(tmp, 'summaries.json'))
+        self.assertEqual(table, loaded)
+        client = FortifySSCClient(self.ssc.url, self.ssc.token)
+        self.assertEqual(120, sum(client.issue_summaries(previous=loaded).totals().values()))
+        self.assertEqual(13, self.ssc.request_count('GET', '*/issueSummaries'), 'only the failed version again')
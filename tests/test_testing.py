@@ -0,0 +1,103 @@
+import os
+import tempfile
+from fortifyapi import FortifySSCClient
+from fortifyapi.client import Issue
+from fortifyapi.exceptions import ResponseException, ResourceNotFound
+from fortifyapi.testing import FakeSSCTestCase
+
+
+class TestFakeSSC(FakeSSCTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.version = self.ssc.add_version('fake project', '1.0', issues=450)
+
+    def test_paging(self):
+        endpoint = f"/api/v1/projectVersions/{self.version['id']}/issues"
+        with self.client.api as api:
+            paged = list(api.page_data(endpoint, limit=100))
+            self.assertEqual(450, len(paged))
+            self.assertEqual(5, self.ssc.request_count('GET', '*/issues'))
+            self.assertEqual(paged, list(api.page_data(endpoint, limit=-1)))
+            self.assertEqual(paged, list(api.page_data(endpoint, limit=100, concurrency=3)))
+            lite = list(api.page_data(endpoint, fields='id,revision'))
+            self.assertEqual({'id', 'revision'}, set(lite[0]))
+
+    def test_query(self):
+        self.ssc.add_version('fake project', '2.0')
+        self.ssc.add_version('other project', '1.0')
+        names = [(v['project']['name'], v['name']) for v in self.client.versions.search(q='name:1.0')]
+        self.assertEqual([('fake project', '1.0'), ('other project', '1.0')], names)
+        names = [v['name'] for v in self.client.versions.search(q='project.name:"fake*",name:2.0')]
+        self.assertEqual(['2.0'], names)
+        names = [v['name'] for v in self.client.versions.search(q='name:2.0+or+project.name:other*')]
+        self.assertEqual(['2.0', '1.0'], names)
+
+    def test_hidden_issues(self):
+        issues = list(self.ssc.issues[self.version['id']].values())
+        for issue, flag in zip(issues, ('suppressed', 'hidden', 'removed')):
+            issue[flag] = True
+        endpoint = f"/api/v1/projectVersions/{self.version['id']}/issues"
+        with self.client.api as api:
+            self.assertEqual(447, api.get(endpoint, limit=1)['count'], 'hidden by default, like SSC')
+            self.assertEqual(448, api.get(endpoint, limit=1, showsuppressed=True)['count'])
+            self.assertEqual(450, api.get(endpoint, limit=1, showsuppressed=True, showhidden=True,
+                                          showremoved=True)['count'])
+            self.assertTrue(api.get(f"{endpoint}/{issues[0]['id']}")['data']['suppressed'])
+
+    def test_credentials(self):
+        client = FortifySSCClient(self.ssc.url, ('admin', 'admin'))
+        self.assertIsNotNone(client.versions.get(self.version['id']))
+        self.assertEqual({self.ssc.token}, self.ssc.tokens, 'the token should be revoked')
+        client = FortifySSCClient(self.ssc.url, 'not a token')
+        with self.assertRaises(ResponseException):
+            client.versions.get(self.version['id'])
+
+    def test_stale_revision(self):
+        version = self.client.versions.get(self.version['id'])
+        with self.client.api as api:
+            issue = Issue(api, next(api.page_data(f"/api/v1/projectVersions/{version['id']}/issues")), version)
+        issue.suppress()
+        with self.assertRaises(ResourceNotFound):
+            issue.suppress()
+
+    def test_bulk(self):
+        version = self.client.versions.get(self.version['id'])
+        with self.client.api as api:
+            issues = [Issue(api, e, version) for e in api.page_data(f"/api/v1/projectVersions/{version['id']}/issues")]
+            with api.batch(size=200):
+                futures = [issue.suppress() for issue in issues]
+        self.assertTrue(all(f.exception() is None for f in futures))
+        self.assertEqual(3, self.ssc.request_count('POST', '*/bulk'))
+        self.assertTrue(all(i['suppressed'] for i in self.ssc.issues[version['id']].values()))
+
+    def test_failures(self):
+        self.ssc.fail_next(1, 403)
+        with self.assertRaises(ResponseException) as raised:
+            self.client.versions.get(self.version['id'])
+        self.assertEqual(403, raised.exception.status)
+        before = self.ssc.request_count()
+        self.ssc.fail_next(2, 503)
+        self.assertIsNotNone(self.client.versions.get(self.version['id']))
+        self.assertEqual(3, self.ssc.request_count() - before, 'a 503 is retried')
+
+    def test_artifacts(self):
+        version = self.client.versions.get(self.version['id'])
+        content = b'PK\x03\x04' + bytes(range(256)) * 64
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        path = os.path.join(tmp.name, 'scan.fpr')
+        with open(path, 'wb') as f:
+            f.write(content)
+        artifact = version.upload_artifact(path, process_block=True)
+        self.assertEqual('PROCESS_COMPLETE', artifact['status'])
+        self.assertEqual(len(content), artifact['fileSize'])
+        self.assertEqual(content, self.ssc.files[('artifact', artifact['id'])])
+
+    def test_cloudjobs(self):
+        pending = self.ssc.add_cloudjob('PENDING', self.version['id'])
+        self.ssc.add_cloudjob('UPLOAD_COMPLETED', self.version['id'])
+        jobs = list(self.client.cloudjobs.list(q='jobState:PENDING'))
+        self.assertEqual([pending['jobToken']], [j['jobToken'] for j in jobs])
+        self.ssc.set_job_state(pending['jobToken'], 'SCAN_RUNNING')
+        self.assertEqual('SCAN_RUNNING', self.client.cloudjobs.get(pending['jobToken'])['jobState'])
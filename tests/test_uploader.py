@@ -0,0 +1,61 @@
+import os
+import tempfile
+import time
+from unittest import mock
+from fortifyapi.testing import FakeSSCTestCase
+from fortifyapi.uploader import ArtifactUploader
+
+
+class TestArtifactUploader(FakeSSCTestCase):
+    fake_options = dict(processing_time=0.2)
+
+    def setUp(self):
+        super().setUp()
+        self.versions = [self.client.versions.get(self.ssc.add_version('project', f"version {i}")['id'])
+                         for i in range(3)]
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.paths = []
+        for i in range(9):
+            self.paths.append(os.path.join(tmp.name, f"scan{i}.fpr"))
+            with open(self.paths[-1], 'wb') as f:
+                f.write(os.urandom(64 * 1024))
+
+    def test_upload(self):
+        sent = {}
+        with ArtifactUploader(self.client.api, workers=3, poll_initial=0.1,
+                              progress=lambda path, done, size: sent.__setitem__(path, done)) as uploader:
+            futures = [uploader.upload(self.versions[i % 3], path) for i, path in enumerate(self.paths)]
+        artifacts = [f.result(timeout=0) for f in futures]
+        self.assertEqual(['PROCESS_COMPLETE'] * 9, [a['status'] for a in artifacts])
+        self.assertEqual([self.versions[i % 3]['id'] for i in range(9)], [a.parent['id'] for a in artifacts])
+        self.assertEqual(9, len(uploader.transfers))
+        self.assertTrue(all(size >= 64 * 1024 for size in sent.values()))
+        self.assertLess(self.ssc.request_count('GET', '*/artifacts'), 9 * 2, 'the watcher polls per version')
+
+    def test_timeout(self):
+        self.ssc.processing_time = 60
+        with ArtifactUploader(self.client.api, poll_initial=0.05, timeout=0.2) as uploader:
+            future = uploader.upload(self.versions[0], self.paths[0])
+        self.assertIsInstance(future.exception(timeout=0), TimeoutError)
+        with ArtifactUploader(self.client.api, wait=False) as uploader:
+            future = uploader.upload(self.versions[0], self.paths[0])
+        self.assertEqual('PROCESSING', future.result(timeout=0)['status'])
+
+    def test_watcher_dies(self):
+        uploader = ArtifactUploader(self.client.api, poll_initial=0.05)
+        with mock.patch.object(uploader, '_poll', side_effect=RuntimeError('bug')), \
+                mock.patch('threading.excepthook'):
+            with uploader:
+                future = uploader.upload(self.versions[0], self.paths[0])
+        self.assertIsInstance(future.exception(timeout=0), RuntimeError)
+
+    def test_close_timeout(self):
+        self.ssc.processing_time = 60
+        uploader = ArtifactUploader(self.client.api, poll_initial=0.05)
+        with self.client.api:
+            future = uploader.upload(self.versions[0], self.paths[0])
+            started = time.monotonic()
+            uploader.close(timeout=0.3)
+        self.assertLess(time.monotonic() - started, 2)
+        self.assertIsInstance(future.exception(timeout=0), TimeoutError)
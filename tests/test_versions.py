@@ -1,7 +1,14 @@
-from unittest import TestCase
+import hashlib
+import io
+import os
+from datetime import datetime, timedelta, timezone
+from unittest import TestCase, mock
 from pprint import pprint
+import requests
 from constants import Constants
-from fortifyapi import FortifySSCClient, Query
+from fortifyapi import FortifySSCClient, Query, Version
+from fortifyapi.exceptions import ResponseException
+from fortifyapi.testing import FakeSSCTestCase
 
 
 class TestVersions(TestCase):
@@ -90,3 +97,136 @@ class TestVersions(TestCase):
             # now
         finally:
             pv.delete()
+
+    def test_version_fields(self):
+        client = FortifySSCClient(self.c.url, self.c.token)
+        self.c.setup_proxy(client)
+        version = next(client.versions.search(fields='lite'))
+        self.assertEqual(set(Version.FIELDS['lite']), set(version.keys()))
+        version = next(client.versions.search(fields=['id', 'name']))
+        self.assertEqual({'id', 'name'}, set(version.keys()))
+
+
+class TestFakeSSCVersions(FakeSSCTestCase):
+
+    def test_lazy_children(self):
+        self.ssc.add_version('lazy project', '1.0', issues=450)
+        project = next(p for p in self.client.projects.list() if p['name'] == 'lazy project')
+        self.assertNotIn('versions', project.__dict__)
+        version = next(project.versions.list())
+        self.assertIs(version.issues, version.issues)
+        self.assertIs(version, version.issues.parent)
+        self.assertEqual({}, dict(version.issues), 'children should not copy the version')
+        self.assertEqual(450, len(list(version.issues.list())))
+
+    def test_diff(self):
+        base = self.ssc.add_version('fake project', 'base', issues=450)
+        baseline = self.ssc.issues[base['id']]
+        pr = self.ssc.add_version('fake project', 'pr')
+        for e in list(baseline.values())[:400]:
+            self.ssc.issues[pr['id']][e['id'] + 10000] = dict(e, id=e['id'] + 10000)
+        self.ssc.add_issues(pr['id'], 30)
+        pr = self.client.versions.get(pr['id'])
+        diff = pr.diff(base)
+        self.assertEqual((30, 50, 400), (len(diff['new']), len(diff['removed']), len(diff['unchanged'])))
+        self.assertEqual(30, sum(diff['counts']['new'].values()))
+        removed = {e['issueInstanceId'] for e in list(baseline.values())[400:]}
+        self.assertEqual(removed, diff['removed'])
+        self.assertEqual({'counts'}, set(pr.diff(base['id'], ids=False)))
+        with self.assertRaises(AssertionError):
+            pr.diff(base, limit=10)
+
+    def test_download(self):
+        content = os.urandom(3 << 20)
+        fake = self.ssc.add_version('fake project', 'download')
+        self.ssc.files[('version', fake['id'])] = content
+        version = self.client.versions.get(fake['id'])
+        self.ssc.interrupt_downloads(2)
+        f = io.BytesIO()
+        result = version.download(dest=f, checksum='sha256', chunk_size=1 << 16)
+        self.assertEqual(content, f.getvalue())
+        self.assertEqual(2, result['resumes'])
+        self.assertEqual(hashlib.sha256(content).hexdigest(), result['checksum'])
+        self.assertEqual(3, self.ssc.request_count('POST', '*/fileTokens'), 'a fresh file token per attempt')
+
+    def test_download_reconnect(self):
+        content = os.urandom(1 << 20)
+        fake = self.ssc.add_version('fake project', 'download')
+        self.ssc.files[('version', fake['id'])] = content
+        version = self.client.versions.get(fake['id'])
+        send = self.client.api._send
+        calls = []
+
+        def flaky(method, endpoint, headers=None, **kwargs):
+            calls.append(headers)
+            if len(calls) == 2:
+                raise requests.exceptions.ConnectionError('refused')
+            return send(method, endpoint, headers=headers, **kwargs)
+
+        self.ssc.interrupt_downloads(1)
+        f = io.BytesIO()
+        with mock.patch.object(self.client.api, '_send', flaky):
+            result = version.download(dest=f, chunk_size=1 << 16)
+        self.assertEqual(content, f.getvalue())
+        self.assertEqual(2, result['resumes'], 'a failed reconnect uses up a retry instead of aborting')
+        with self.assertRaises(TypeError):
+            version.download(False)
+
+    def test_download_without_range(self):
+        content = os.urandom(1 << 20)
+        fake = self.ssc.add_version('fake project', 'download')
+        self.ssc.files[('version', fake['id'])] = content
+        version = self.client.versions.get(fake['id'])
+        send = self.client.api._send
+
+        def ignore_range(method, endpoint, headers=None, **kwargs):
+            return send(method, endpoint, **kwargs)
+
+        class Pipe(io.RawIOBase):
+            def writable(self):
+                return True
+
+            def write(self, b):
+                return len(b)
+
+        with mock.patch.object(self.client.api, '_send', ignore_range):
+            self.ssc.interrupt_downloads(1)
+            f = io.BytesIO(b'header')
+            f.seek(0, io.SEEK_END)
+            version.download(dest=f, chunk_size=1 << 16)
+            self.assertEqual(b'header' + content, f.getvalue(), 'rewound to where it started')
+            self.ssc.interrupt_downloads(1)
+            with self.assertRaises(ResponseException):
+                version.download(dest=Pipe(), chunk_size=1 << 16)
+
+    def test_collect_garbage(self):
+        kept = self.ssc.add_version('fake project', '1.0')
+        old = datetime.now(timezone.utc) - timedelta(days=60)
+        for i in range(30):
+            self.ssc.add_version('fake project', f"PR-{i}", created=old, last_upload=old if i % 3 else None)
+        self.ssc.add_version('fake project', 'PR-new')
+        self.ssc.add_version('other project', 'PR-0', created=old, last_upload=datetime.now(timezone.utc))
+        versions = self.client.versions
+        result = versions.collect_garbage(name='PR-*', uploaded_before=timedelta(days=30), dry_run=True)
+        self.assertEqual(30, len(result['selected']))
+        self.assertEqual(33, len(self.ssc.versions))
+
+        before = self.ssc.request_count()
+        result = versions.collect_garbage(name='PR-*', created_before=timedelta(days=30), size=10, rate=100)
+        self.assertEqual(31, len(result['deleted']))
+        self.assertEqual({}, result['failed'])
+        self.assertGreaterEqual(result['seconds'], 0.3, 'capped at 100 a second')
+        self.assertEqual(1 + 4, self.ssc.request_count() - before, 'one listing, bulk deletes of 10')
+        self.assertEqual({'1.0', 'PR-new'}, {v['name'] for v in self.ssc.versions.values()})
+
+        undated = self.ssc.add_version('fake project', 'PR-undated')
+        undated.pop('creationDate')
+        result = self.client.projects.get(kept['project']['id']).versions.collect_garbage(
+            project='fake*', uploaded_before=timedelta(days=30), created_before=timedelta(days=30), dry_run=True)
+        self.assertEqual([], result['selected'], 'kept without a date')
+
+        project = self.client.projects.get(kept['project']['id'])
+        self.assertEqual(3, len(project.delete()['deleted']))
+        self.assertEqual({}, self.ssc.versions)
+        with self.assertRaises(AssertionError):
+            versions.collect_garbage()